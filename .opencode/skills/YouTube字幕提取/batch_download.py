@@ -9,23 +9,34 @@
 """
 
 import argparse
+import logging
+import os
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-import subprocess
 
+import requests
 
-def extract_video_id(url: str) -> str:
-    """从 URL 中提取视频 ID"""
-    import re
+from download_subtitle import download_and_convert
+
+logger = logging.getLogger(__name__)
 
-    patterns = [
+# 模块级预编译，避免每次调用的正则缓存查找
+_VIDEO_ID_PATTERNS = tuple(
+    re.compile(p)
+    for p in (
         r"(?:v=|\/)([0-9A-Za-z_-]{11}).*",
         r"youtu\.be\/([0-9A-Za-z_-]{11})",
         r"embed\/([0-9A-Za-z_-]{11})",
-    ]
+    )
+)
+
 
-    for pattern in patterns:
-        match = re.search(pattern, url)
+def extract_video_id(url: str) -> str:
+    """从 URL 中提取视频 ID"""
+    for pattern in _VIDEO_ID_PATTERNS:
+        match = pattern.search(url)
         if match:
             return match.group(1)
 
@@ -35,6 +46,26 @@ def extract_video_id(url: str) -> str:
     return None
 
 
+def download_one(url: str, video_id: str, output_file: Path, index: int, total: int, args):
+    """下载单个视频的字幕，返回 (成功与否, 状态信息)"""
+    # 在本进程内直接调用下载函数，避免每个 URL 启动一个新的 Python 进程。
+    # 只捕获预期的网络/文件错误，编程错误直接抛出（--fail-fast 时所有错误都抛出）
+    try:
+        ok, err = download_and_convert(url, args.lang, args.format, str(output_file))
+        if ok:
+            return True, f"[{index}/{total}] 📹 {video_id} ✅ 成功"
+        # download_and_convert 把每种语言的下载异常都吞掉、只返回 (False, msg)，
+        # fail-fast 需要把失败结果升级成异常才能中止整个批次
+        if args.fail_fast:
+            raise RuntimeError(f"{video_id}: {err}")
+        return False, f"[{index}/{total}] 📹 {video_id} ❌ 失败: {err}"
+    except (requests.RequestException, OSError) as e:
+        if args.fail_fast:
+            raise
+        logger.warning("下载出错 %s: %s", url, e)
+        return False, f"[{index}/{total}] 📹 {video_id} ❌ 错误: {str(e)}"
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="批量下载 YouTube 视频字幕",
@@ -68,8 +99,18 @@ URL 文件格式:
         help="输出格式（默认: markdown）",
     )
 
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=8, help="并发下载数（默认: 8）"
+    )
+
+    parser.add_argument(
+        "--fail-fast", action="store_true", help="遇到第一个错误立即退出"
+    )
+
     args = parser.parse_args()
 
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(message)s")
+
     # 读取 URL 列表
     input_file = Path(args.input)
     if not input_file.exists():
@@ -89,56 +130,53 @@ URL 文件格式:
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # 批量下载
+    # 先过滤掉无效 URL 和已存在的输出，只把真正要做的工作提交给线程池，
+    # 进度分母也因此反映实际工作量
     success_count = 0
     fail_count = 0
+    skip_count = 0
 
-    for i, url in enumerate(urls, 1):
+    ext = "md" if args.format == "markdown" else args.format
+    todo = []
+    for url in urls:
         video_id = extract_video_id(url)
         if not video_id:
-            print(f"\n[{i}/{len(urls)}] ⏭️  跳过无效 URL: {url}", file=sys.stderr)
+            print(f"⏭️  跳过无效 URL: {url}", file=sys.stderr)
             fail_count += 1
             continue
 
-        print(f"\n[{i}/{len(urls)}] 📹 {video_id}", file=sys.stderr)
-
-        # 生成输出文件名
-        ext = "md" if args.format == "markdown" else args.format
         output_file = output_dir / f"{video_id}.{ext}"
-
-        if output_file.exists():
-            print(f"  ⏭️  跳过 (已存在)", file=sys.stderr)
+        # lexists 不跟随符号链接，比 Path.exists() 更省
+        if os.path.lexists(output_file):
+            skip_count += 1
             continue
 
-        # 调用下载脚本
-        cmd = [
-            "python",
-            Path(__file__).parent / "download_subtitle.py",
-            "--url",
-            url,
-            "--lang",
-            args.lang,
-            "--format",
-            args.format,
-            "--output",
-            str(output_file),
+        todo.append((url, video_id, output_file))
+
+    if skip_count:
+        print(f"⏭️  跳过 {skip_count} 个已存在的文件", file=sys.stderr)
+
+    # 批量下载（并发执行，下载是纯网络等待，线程池几乎线性加速）
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+        futures = [
+            executor.submit(download_one, url, video_id, output_file, i, len(todo), args)
+            for i, (url, video_id, output_file) in enumerate(todo, 1)
         ]
 
-        try:
-            result = subprocess.run(
-                cmd, capture_output=True, text=True, check=True, timeout=60
-            )
-            print(f"  ✅ 成功", file=sys.stderr)
-            success_count += 1
-        except subprocess.TimeoutExpired:
-            print(f"  ❌ 超时", file=sys.stderr)
-            fail_count += 1
-        except subprocess.CalledProcessError as e:
-            print(f"  ❌ 失败: {e.stderr}", file=sys.stderr)
-            fail_count += 1
-        except Exception as e:
-            print(f"  ❌ 错误: {str(e)}", file=sys.stderr)
-            fail_count += 1
+        for future in as_completed(futures):
+            try:
+                ok, message = future.result()
+            except (RuntimeError, requests.RequestException, OSError) as e:
+                # --fail-fast：第一个失败即取消未开始的任务并退出
+                for pending in futures:
+                    pending.cancel()
+                print(f"❌ 中止批量下载: {e}", file=sys.stderr)
+                sys.exit(1)
+            print(message, file=sys.stderr)
+            if ok:
+                success_count += 1
+            else:
+                fail_count += 1
 
     # 输出统计
     print("\n" + "=" * 60, file=sys.stderr)
@@ -9,109 +9,84 @@
 """
 
 import argparse
+import mmap
 import sys
 import re
 from pathlib import Path
 
 
-def parse_vtt(content: str) -> list:
-    """解析 VTT 字幕文件"""
-    lines = content.split("\n")
-    subtitles = []
-    current_time = None
-    current_text = []
-
-    for line in lines:
-        line = line.strip()
-
-        # 跳过 WEBVTT 头部和空行
-        if (
-            line.startswith("WEBVTT")
-            or line.startswith("Kind:")
-            or line.startswith("Language:")
-        ):
-            continue
-
-        # 时间戳行
-        if "-->" in line:
-            if current_time and current_text:
-                subtitles.append({"time": current_time, "text": " ".join(current_text)})
-                current_text = []
-
-            # 提取开始时间
-            current_time = line.split("-->")[0].strip()
-        elif line and not line.isdigit():
-            # 字幕文本
-            current_text.append(line)
-
-    # 添加最后一条
-    if current_time and current_text:
-        subtitles.append({"time": current_time, "text": " ".join(current_text)})
+# 预编译的单遍扫描正则（bytes 级）：一次 C 级扫描提取 (时间戳, 文本块)，
+# 避免逐行 strip/startswith 的解释器开销（长视频自动字幕可达数万行）。
+# 直接在 bytes/mmap 缓冲区上匹配，只对命中的捕获组做 decode。
+# 文本行排除含 "-->" 的行并把 \r\n 当作行终止，CRLF 文件（SRT 常见）
+# 的分隔行才真正结束一个字幕块，不会把后续时间戳吞进文本。
+_VTT_CUE_RE = re.compile(
+    rb"([0-9:.]+)[ \t]*-->[^\r\n]*\r?\n((?:(?![^\r\n]*-->)[^\r\n]+\r?\n?)*)"
+)
+_SRT_CUE_RE = re.compile(
+    rb"([0-9:,]+)[ \t]*-->[^\r\n]*\r?\n((?:(?![^\r\n]*-->)[^\r\n]+\r?\n?)*)"
+)
+
 
+def _parse_cues(buf, cue_re) -> list:
+    """在 bytes 缓冲区上扫描字幕块，过滤空行和纯数字序号行"""
+    subtitles = []
+    for match in cue_re.finditer(buf):
+        text = " ".join(
+            line
+            for line in (l.strip() for l in match.group(2).decode("utf-8").splitlines())
+            if line and not line.isdigit()
+        )
+        if text:
+            subtitles.append({"time": match.group(1).decode("ascii"), "text": text})
     return subtitles
 
 
-def parse_srt(content: str) -> list:
-    """解析 SRT 字幕文件"""
-    lines = content.split("\n")
-    subtitles = []
-    current_time = None
-    current_text = []
-    expect_time = False
-
-    for line in lines:
-        line = line.strip()
-
-        # 序号行（纯数字）
-        if line.isdigit():
-            if current_time and current_text:
-                subtitles.append({"time": current_time, "text": " ".join(current_text)})
-                current_text = []
-                current_time = None
-            expect_time = True
-        # 时间戳行
-        elif "-->" in line and expect_time:
-            current_time = line.split("-->")[0].strip()
-            expect_time = False
-        # 字幕文本
-        elif line:
-            current_text.append(line)
-
-    # 添加最后一条
-    if current_time and current_text:
-        subtitles.append({"time": current_time, "text": " ".join(current_text)})
+def parse_vtt(content) -> list:
+    """解析 VTT 字幕文件（接受 str、bytes 或 mmap 缓冲区）"""
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return _parse_cues(content, _VTT_CUE_RE)
+
+
+def parse_srt(content) -> list:
+    """解析 SRT 字幕文件（接受 str、bytes 或 mmap 缓冲区）"""
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return _parse_cues(content, _SRT_CUE_RE)
+
+
+_TIME_RE = re.compile(r"(\d+):(\d+):(\d+)")
 
-    return subtitles
+
+def _format_time(time_str: str) -> str:
+    """转换时间格式 (00:00:48.666 -> 00:48)，处理多种时间格式"""
+    time_match = _TIME_RE.search(time_str)
+    if not time_match:
+        return time_str
+
+    hours = int(time_match.group(1))
+    minutes = int(time_match.group(2))
+    seconds = int(time_match.group(3))
+
+    if hours > 0:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes:02d}:{seconds:02d}"
 
 
 def convert_to_markdown(subtitles: list, title: str = "YouTube 视频字幕") -> str:
     """将字幕转换为 Markdown 格式"""
-    markdown = f"# {title}\n\n"
-    markdown += f"字幕条数: {len(subtitles)}\n\n"
-    markdown += "---\n\n"
+    # 用列表收集再一次 join，避免循环内字符串拼接的 O(N²) 复制
+    parts = [
+        f"# {title}\n\n",
+        f"字幕条数: {len(subtitles)}\n\n",
+        "---\n\n",
+    ]
 
     for entry in subtitles:
-        time_str = entry["time"]
-        text = entry["text"]
-
-        # 转换时间格式 (00:00:48.666 -> 00:48)
-        # 处理多种时间格式
-        time_match = re.search(r"(\d+):(\d+):(\d+)", time_str)
-        if time_match:
-            hours = int(time_match.group(1))
-            minutes = int(time_match.group(2))
-            seconds = int(time_match.group(3))
-
-            if hours > 0:
-                time_display = f"{hours}:{minutes:02d}:{seconds:02d}"
-            else:
-                time_display = f"{minutes:02d}:{seconds:02d}"
-        else:
-            time_display = time_str
-
-        markdown += f"**[{time_display}]** {text}\n\n"
+        parts.append(f"**[{_format_time(entry['time'])}]** {entry['text']}\n\n")
 
-    return markdown
+    return "".join(parts)
 
 
 def main():
@@ -145,28 +120,39 @@ def main():
         print(f"❌ 错误: 文件不存在: {input_path}", file=sys.stderr)
         sys.exit(1)
 
-    with open(input_path, "r", encoding="utf-8") as f:
-        content = f.read()
-
-    # 根据文件类型解析
-    file_ext = input_path.suffix.lower()
-    print(f"📄 解析 {file_ext} 文件...", file=sys.stderr)
-
-    if file_ext == ".vtt":
-        subtitles = parse_vtt(content)
-    elif file_ext == ".srt":
-        subtitles = parse_srt(content)
-    else:
-        # 尝试自动检测
-        if "WEBVTT" in content:
-            print("   检测为 VTT 格式", file=sys.stderr)
-            subtitles = parse_vtt(content)
-        elif "-->" in content and content.split("\n")[0].isdigit():
-            print("   检测为 SRT 格式", file=sys.stderr)
-            subtitles = parse_srt(content)
-        else:
-            print("❌ 错误: 无法识别文件格式", file=sys.stderr)
-            sys.exit(1)
+    # mmap 按需分页读取，避免把整个文件复制成 Python str；
+    # 解析正则直接在缓冲区上匹配，只 decode 命中的捕获组
+    with open(input_path, "rb") as f:
+        try:
+            content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # 空文件无法 mmap
+            content = b""
+
+        try:
+            # 根据文件类型解析
+            file_ext = input_path.suffix.lower()
+            print(f"📄 解析 {file_ext} 文件...", file=sys.stderr)
+
+            if file_ext == ".vtt":
+                subtitles = parse_vtt(content)
+            elif file_ext == ".srt":
+                subtitles = parse_srt(content)
+            else:
+                # 尝试自动检测
+                first_line = bytes(content[: max(content.find(b"\n"), 0)])
+                if content.find(b"WEBVTT") != -1:
+                    print("   检测为 VTT 格式", file=sys.stderr)
+                    subtitles = parse_vtt(content)
+                elif content.find(b"-->") != -1 and first_line.strip().isdigit():
+                    print("   检测为 SRT 格式", file=sys.stderr)
+                    subtitles = parse_srt(content)
+                else:
+                    print("❌ 错误: 无法识别文件格式", file=sys.stderr)
+                    sys.exit(1)
+        finally:
+            if isinstance(content, mmap.mmap):
+                content.close()
 
     if not subtitles:
         print("❌ 错误: 未找到任何字幕", file=sys.stderr)
@@ -182,8 +168,8 @@ def main():
         output_path = Path(args.output)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(markdown_content)
+        # 一次性二进制写入，跳过文本模式的换行符转换和额外编码遍历
+        output_path.write_bytes(markdown_content.encode("utf-8"))
 
         print(f"📝 已保存到: {output_path}", file=sys.stderr)
     else:
@@ -11,22 +11,43 @@ YouTube 字幕下载工具
 
 import argparse
 import sys
-import subprocess
-import tempfile
 import re
 from pathlib import Path
 
-
-def extract_video_id(url: str) -> str:
-    """从 URL 中提取视频 ID"""
-    patterns = [
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from yt_dlp import YoutubeDL
+from yt_dlp.utils import DownloadError
+
+# 共享 Session：HTTP keep-alive 复用连接，批量下载时省去每次 TLS 握手；
+# 连接池放大到 32 以配合批量下载的线程池并发
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=32,
+        max_retries=Retry(total=3, backoff_factor=0.3),
+    ),
+)
+
+
+# 模块级预编译，避免每次调用的正则缓存查找
+_VIDEO_ID_PATTERNS = tuple(
+    re.compile(p)
+    for p in (
         r"(?:v=|\/)([0-9A-Za-z_-]{11}).*",
         r"youtu\.be\/([0-9A-Za-z_-]{11})",
         r"embed\/([0-9A-Za-z_-]{11})",
-    ]
+    )
+)
+
 
-    for pattern in patterns:
-        match = re.search(pattern, url)
+def extract_video_id(url: str) -> str:
+    """从 URL 中提取视频 ID"""
+    for pattern in _VIDEO_ID_PATTERNS:
+        match = pattern.search(url)
         if match:
             return match.group(1)
 
@@ -40,127 +61,195 @@ def extract_video_id(url: str) -> str:
 def list_subtitles(url: str) -> bool:
     """列出可用的字幕"""
     try:
-        result = subprocess.run(
-            ["yt-dlp", "--list-subs", url],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        print(result.stdout)
+        with YoutubeDL({"quiet": True, "no_warnings": True}) as ydl:
+            info = ydl.extract_info(url, download=False)
+
+        for title, key in [("手动字幕", "subtitles"), ("自动字幕", "automatic_captions")]:
+            langs = sorted((info.get(key) or {}).keys())
+            print(f"{title} ({len(langs)}):")
+            print(", ".join(langs) if langs else "  (无)")
+            print()
         return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ 错误: {e.stderr}", file=sys.stderr)
+    except DownloadError as e:
+        print(f"❌ 错误: {str(e)}", file=sys.stderr)
         return False
 
 
-def download_subtitle(url: str, lang: str, output_format: str = "vtt") -> Path:
-    """下载字幕文件"""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir_path = Path(tmpdir)
-        output_template = str(tmpdir_path / "subtitle")
-
-        cmd = [
-            "yt-dlp",
-            "--write-subs",
-            "--write-auto-subs",  # 同时支持自动字幕
-            "--sub-lang",
-            lang,
-            "--skip-download",
-            "--sub-format",
-            output_format,
-            "--output",
-            output_template,
-            url,
-        ]
+def download_subtitle(url: str, lang: str, output_format: str = "vtt") -> str:
+    """下载字幕文件，返回字幕内容
 
-        try:
-            subprocess.run(cmd, check=True, capture_output=True)
+    只取字幕的直链 URL 并直接读进内存，
+    不再经过临时目录的「写文件 → glob → 读回」三次文件系统往返。
+    """
+    # 使用 yt-dlp Python API，避免每次调用 fork+exec 一个新进程
+    opts = {
+        "writesubtitles": True,
+        "writeautomaticsub": True,  # 同时支持自动字幕
+        "subtitleslangs": [lang],
+        "skip_download": True,
+        "subtitlesformat": output_format,
+        "quiet": True,
+        "no_warnings": True,
+    }
 
-            # 查找下载的字幕文件
-            subtitle_files = list(tmpdir_path.glob(f"*.{lang}.{output_format}"))
-            if not subtitle_files:
-                # 尝试查找任何字幕文件
-                subtitle_files = list(tmpdir_path.glob(f"*.{output_format}"))
+    try:
+        with YoutubeDL(opts) as ydl:
+            info = ydl.extract_info(url, download=False)
+    except DownloadError as e:
+        raise Exception(f"下载字幕失败: {str(e)}")
 
-            if not subtitle_files:
-                raise FileNotFoundError("未找到下载的字幕文件")
+    subtitle = (info.get("requested_subtitles") or {}).get(lang)
+    if not subtitle or not subtitle.get("url"):
+        raise FileNotFoundError("未找到下载的字幕文件")
 
-            # 读取内容
-            subtitle_path = subtitle_files[0]
-            with open(subtitle_path, "r", encoding="utf-8") as f:
-                content = f.read()
+    response = _SESSION.get(subtitle["url"], timeout=30)
+    response.raise_for_status()
+    return response.text
 
-            return content
 
-        except subprocess.CalledProcessError as e:
-            error_msg = e.stderr.decode() if e.stderr else str(e)
-            raise Exception(f"下载字幕失败: {error_msg}")
+# 预编译的单遍扫描正则：一次 C 级扫描提取 (时间戳, 文本块)，
+# 避免逐行 strip/startswith 的解释器开销（长视频自动字幕可达数万行）。
+# 文本行排除含 "-->" 的行并把 \r\n 当作行终止，CRLF 输入不会把
+# 后续时间戳吞进同一个字幕块。
+_VTT_CUE_RE = re.compile(
+    r"([0-9:.]+)[ \t]*-->[^\r\n]*\r?\n((?:(?![^\r\n]*-->)[^\r\n]+\r?\n?)*)"
+)
 
 
 def parse_vtt(content: str) -> list:
     """解析 VTT 字幕文件"""
-    lines = content.split("\n")
     subtitles = []
-    current_time = None
-    current_text = []
-
-    for line in lines:
-        line = line.strip()
-
-        # 跳过 WEBVTT 头部和空行
-        if (
-            line.startswith("WEBVTT")
-            or line.startswith("Kind:")
-            or line.startswith("Language:")
-        ):
-            continue
+    for match in _VTT_CUE_RE.finditer(content):
+        text = " ".join(
+            line for line in (l.strip() for l in match.group(2).splitlines())
+            if line and not line.isdigit()
+        )
+        if text:
+            subtitles.append({"time": match.group(1), "text": text})
+    return subtitles
 
-        # 时间戳行
-        if "-->" in line:
-            if current_time and current_text:
-                subtitles.append({"time": current_time, "text": " ".join(current_text)})
-                current_text = []
 
-            # 提取开始时间
-            current_time = line.split("-->")[0].strip()
-        elif line and not line.isdigit():
-            # 字幕文本
-            current_text.append(line)
+def _format_time(time_str: str) -> str:
+    """转换时间格式 (00:00:48.666 -> 00:48)"""
+    time_parts = time_str.split(":")
+    if len(time_parts) >= 2:
+        minutes = time_parts[-2]
+        seconds = time_parts[-1].split(".")[0]
+        return f"{minutes}:{seconds}"
+    return time_str
 
-    # 添加最后一条
-    if current_time and current_text:
-        subtitles.append({"time": current_time, "text": " ".join(current_text)})
 
-    return subtitles
+def vtt_to_markdown(content: str, video_id: str = None):
+    """解析 VTT 并直接生成 Markdown（单次扫描）
+
+    融合 parse_vtt + convert_to_markdown 两遍循环：
+    正则扫描边产出匹配边拼接 Markdown 条目，省掉中间的 list[dict]。
+
+    Returns:
+        tuple: (Markdown 内容, 字幕条数)
+    """
+    parts = ["# YouTube 视频字幕\n\n"]
+
+    if video_id:
+        parts.append(f"视频 ID: `{video_id}`\n\n")
+        parts.append(f"视频链接: https://www.youtube.com/watch?v={video_id}\n\n")
+
+    # 字幕条数要等扫描结束才知道，先记下插入位置
+    count_index = len(parts)
+    parts.append("---\n\n")
+
+    count = 0
+    for match in _VTT_CUE_RE.finditer(content):
+        text = " ".join(
+            line for line in (l.strip() for l in match.group(2).splitlines())
+            if line and not line.isdigit()
+        )
+        if text:
+            parts.append(f"**[{_format_time(match.group(1))}]** {text}\n\n")
+            count += 1
+
+    parts.insert(count_index, f"字幕条数: {count}\n\n")
+    return "".join(parts), count
 
 
 def convert_to_markdown(subtitles: list, video_id: str = None) -> str:
     """将字幕转换为 Markdown 格式"""
-    markdown = "# YouTube 视频字幕\n\n"
+    # 用列表收集再一次 join，避免循环内字符串拼接的 O(N²) 复制
+    parts = ["# YouTube 视频字幕\n\n"]
 
     if video_id:
-        markdown += f"视频 ID: `{video_id}`\n\n"
-        markdown += f"视频链接: https://www.youtube.com/watch?v={video_id}\n\n"
+        parts.append(f"视频 ID: `{video_id}`\n\n")
+        parts.append(f"视频链接: https://www.youtube.com/watch?v={video_id}\n\n")
 
-    markdown += f"字幕条数: {len(subtitles)}\n\n"
-    markdown += "---\n\n"
+    parts.append(f"字幕条数: {len(subtitles)}\n\n")
+    parts.append("---\n\n")
 
     for entry in subtitles:
-        time_str = entry["time"]
-        text = entry["text"]
-
-        # 转换时间格式 (00:00:48.666 -> 00:48)
-        time_parts = time_str.split(":")
-        if len(time_parts) >= 2:
-            minutes = time_parts[-2]
-            seconds = time_parts[-1].split(".")[0]
-            time_display = f"{minutes}:{seconds}"
-        else:
-            time_display = time_str
+        parts.append(f"**[{_format_time(entry['time'])}]** {entry['text']}\n\n")
+
+    return "".join(parts)
 
-        markdown += f"**[{time_display}]** {text}\n\n"
 
-    return markdown
+def download_and_convert(
+    url: str, lang: str, output_format: str = "markdown", output: str = None
+):
+    """下载字幕并转换为指定格式，可被其他脚本直接导入调用
+
+    Args:
+        url: YouTube 视频 URL
+        lang: 字幕语言（逗号分隔，按顺序尝试）
+        output_format: 输出格式 (markdown, vtt, srt)
+        output: 输出文件路径（None 则打印到 stdout）
+
+    Returns:
+        tuple: (是否成功, 错误信息或 None)
+    """
+    video_id = extract_video_id(url)
+    if not video_id:
+        return False, "无法从 URL 中提取视频 ID"
+
+    languages = [l.strip() for l in lang.split(",")]
+
+    # 尝试每种语言
+    content = None
+    used_lang = None
+
+    for sub_lang in languages:
+        try:
+            content = download_subtitle(url, sub_lang, "vtt")
+            used_lang = sub_lang
+            break
+        except Exception:
+            continue
+
+    if not content:
+        return False, "未找到任何可用字幕"
+
+    print(f"✅ 成功下载 {used_lang} 字幕", file=sys.stderr)
+
+    # 处理输出
+    if output_format == "markdown":
+        output_content, count = vtt_to_markdown(content, video_id)
+        print(f"📊 共 {count} 条字幕", file=sys.stderr)
+    else:
+        output_content = content
+
+    # 保存或输出
+    if output:
+        output_path = Path(output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # 一次性二进制写入，跳过文本模式的换行符转换和额外编码遍历
+        output_path.write_bytes(output_content.encode("utf-8"))
+
+        print(f"📝 已保存到: {output_path}", file=sys.stderr)
+    else:
+        print("\n" + "=" * 60, file=sys.stderr)
+        print("字幕内容:", file=sys.stderr)
+        print("=" * 60 + "\n", file=sys.stderr)
+        print(output_content)
+
+    return True, None
 
 
 def main():
@@ -228,50 +317,12 @@ def main():
     print(f"🔍 下载字幕 (语言: {', '.join(languages)})...", file=sys.stderr)
 
     try:
-        # 尝试每种语言
-        content = None
-        used_lang = None
-
-        for lang in languages:
-            try:
-                print(f"   尝试语言: {lang}...", file=sys.stderr)
-                content = download_subtitle(args.url, lang, "vtt")
-                used_lang = lang
-                break
-            except Exception as e:
-                print(f"   {lang} 不可用", file=sys.stderr)
-                continue
-
-        if not content:
-            print("❌ 错误: 未找到任何可用字幕", file=sys.stderr)
+        ok, err = download_and_convert(args.url, args.lang, args.format, args.output)
+        if not ok:
+            print(f"❌ 错误: {err}", file=sys.stderr)
             print("提示: 使用 --list-subs 查看可用语言", file=sys.stderr)
             sys.exit(1)
 
-        print(f"✅ 成功下载 {used_lang} 字幕", file=sys.stderr)
-
-        # 处理输出
-        if args.format == "markdown":
-            subtitles = parse_vtt(content)
-            output_content = convert_to_markdown(subtitles, video_id)
-            print(f"📊 共 {len(subtitles)} 条字幕", file=sys.stderr)
-        else:
-            output_content = content
-
-        # 保存或输出
-        if args.output:
-            output_path = Path(args.output)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-
-            with open(output_path, "w", encoding="utf-8") as f:
-                f.write(output_content)
-
-            print(f"📝 已保存到: {output_path}", file=sys.stderr)
-        else:
-            print("\n" + "=" * 60, file=sys.stderr)
-            print("字幕内容:", file=sys.stderr)
-            print("=" * 60 + "\n", file=sys.stderr)
-            print(output_content)
-
     except Exception as e:
         print(f"❌ 错误: {str(e)}", file=sys.stderr)
         sys.exit(1)
@@ -10,34 +10,49 @@
 """
 
 import argparse
+import logging
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import List
-import fnmatch
+
+logger = logging.getLogger(__name__)
+
+# 每个工作进程持有一个 MarkItDown 实例，由 initializer 构造一次
+_worker_md = None
+
+
+def _init_worker(md_kwargs):
+    """工作进程初始化：构造进程内共享的 MarkItDown 实例"""
+    global _worker_md
+    from markitdown import MarkItDown
+
+    _worker_md = MarkItDown(**md_kwargs)
+
+
+def _convert_task(input_file: str, output_file: str, fail_fast: bool = False) -> bool:
+    """工作进程中执行单个文件转换"""
+    return convert_file(_worker_md, Path(input_file), Path(output_file), fail_fast)
 
 
 def find_files(
     input_dir: Path, pattern: str = "*", recursive: bool = False
 ) -> List[Path]:
-    """查找匹配的文件"""
-    files = []
-
-    if recursive:
-        for root, _, filenames in os.walk(input_dir):
-            for filename in filenames:
-                if fnmatch.fnmatch(filename, pattern):
-                    files.append(Path(root) / filename)
-    else:
-        for file_path in input_dir.iterdir():
-            if file_path.is_file() and fnmatch.fnmatch(file_path.name, pattern):
-                files.append(file_path)
+    """查找匹配的文件
 
-    return sorted(files)
+    glob/rglob 底层走 os.scandir + C 级模式匹配，
+    比 os.walk + 每个文件一次 Python 级 fnmatch 快得多。
+    """
+    it = input_dir.rglob(pattern) if recursive else input_dir.glob(pattern)
+    return sorted(p for p in it if p.is_file())
 
 
-def convert_file(md, input_file: Path, output_file: Path) -> bool:
+def convert_file(md, input_file: Path, output_file: Path, fail_fast: bool = False) -> bool:
     """转换单个文件"""
+    from markitdown import MarkItDownException
+
+    # 只捕获预期的转换/文件错误，编程错误直接抛出（--fail-fast 时所有错误都抛出）
     try:
         result = md.convert(str(input_file))
 
@@ -49,8 +64,10 @@ def convert_file(md, input_file: Path, output_file: Path) -> bool:
             f.write(result.text_content)
 
         return True
-    except Exception as e:
-        print(f"  ❌ 失败: {str(e)}", file=sys.stderr)
+    except (MarkItDownException, OSError, ValueError) as e:
+        if fail_fast:
+            raise
+        logger.warning("转换失败 %s: %s", input_file, e)
         return False
 
 
@@ -94,8 +111,22 @@ def main():
         "--skip-existing", action="store_true", help="跳过已存在的输出文件"
     )
 
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=min(8, os.cpu_count() or 1),
+        help="并行转换进程数（默认: min(8, CPU 核数)）",
+    )
+
+    parser.add_argument(
+        "--fail-fast", action="store_true", help="遇到第一个错误立即退出"
+    )
+
     args = parser.parse_args()
 
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(message)s")
+
     try:
         from markitdown import MarkItDown
     except ImportError:
@@ -140,14 +171,13 @@ def main():
             file=sys.stderr,
         )
 
-    md = MarkItDown(**kwargs)
-
-    # 批量转换
+    # 批量转换（进程池并行，PDF/Office 解析是 CPU 密集型，线程会被 GIL 串行化）
     success_count = 0
     skip_count = 0
     fail_count = 0
 
-    for i, input_file in enumerate(files, 1):
+    tasks = []
+    for input_file in files:
         # 计算相对路径
         try:
             rel_path = input_file.relative_to(input_dir)
@@ -157,23 +187,35 @@ def main():
         # 生成输出文件路径（将扩展名改为 .md）
         output_file = output_dir / rel_path.with_suffix(".md")
 
-        print(f"[{i}/{len(files)}] {rel_path}", file=sys.stderr)
-
-        # 检查是否跳过
-        if args.skip_existing and output_file.exists():
-            print(f"  ⏭️  跳过 (已存在)", file=sys.stderr)
+        # 检查是否跳过（lexists 不跟随符号链接，比 Path.exists() 更省）
+        if args.skip_existing and os.path.lexists(output_file):
+            print(f"⏭️  跳过 (已存在): {rel_path}", file=sys.stderr)
             skip_count += 1
             continue
 
-        # 转换文件
-        print(f"  🔄 转换中...", file=sys.stderr)
-        if convert_file(md, input_file, output_file):
-            print(f"  ✅ 成功 -> {output_file}", file=sys.stderr)
-            success_count += 1
-        else:
-            fail_count += 1
-
-        print()
+        tasks.append((rel_path, input_file, output_file))
+
+    with ProcessPoolExecutor(
+        max_workers=max(1, args.jobs), initializer=_init_worker, initargs=(kwargs,)
+    ) as executor:
+        futures = {
+            executor.submit(
+                _convert_task, str(input_file), str(output_file), args.fail_fast
+            ): (
+                rel_path,
+                output_file,
+            )
+            for rel_path, input_file, output_file in tasks
+        }
+
+        for i, future in enumerate(as_completed(futures), 1):
+            rel_path, output_file = futures[future]
+            if future.result():
+                print(f"[{i}/{len(tasks)}] ✅ {rel_path} -> {output_file}", file=sys.stderr)
+                success_count += 1
+            else:
+                print(f"[{i}/{len(tasks)}] ❌ {rel_path}", file=sys.stderr)
+                fail_count += 1
 
     # 输出统计
     print("=" * 60, file=sys.stderr)
@@ -11,10 +11,266 @@
 """
 
 import argparse
+import asyncio
+import base64
+import json
 import sys
 import os
+import tempfile
+import time
+from functools import lru_cache
 from pathlib import Path
 
+DEFAULT_PROMPT = "详细描述这张图片的内容"
+
+
+@lru_cache(maxsize=4)
+def _make_client(items):
+    """按 kwargs 缓存 OpenAI 客户端，同进程重复调用复用连接池"""
+    from openai import OpenAI
+
+    return OpenAI(**dict(items))
+
+# 写出块大小：1 MiB，配合同样大小的文件缓冲
+_WRITE_CHUNK = 1 << 20
+
+
+def _write_markdown(output_path, markdown_content):
+    """分块写出 Markdown，峰值内存只多一个块"""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8", buffering=_WRITE_CHUNK) as f:
+        for i in range(0, len(markdown_content), _WRITE_CHUNK):
+            f.write(markdown_content[i : i + _WRITE_CHUNK])
+
+
+def extract_pptx_images(input_path):
+    """枚举 .pptx 中的幻灯片图片
+
+    Returns:
+        list: [(幻灯片序号, 图片序号, 图片字节, MIME 类型), ...]
+    """
+    from pptx import Presentation
+
+    images = []
+    prs = Presentation(input_path)
+    for slide_no, slide in enumerate(prs.slides, 1):
+        image_no = 0
+        for shape in slide.shapes:
+            # 仅图片形状有 image 属性
+            try:
+                image = shape.image
+            except (AttributeError, ValueError):
+                continue
+            image_no += 1
+            images.append((slide_no, image_no, image.blob, image.content_type))
+    return images
+
+
+async def _describe_all(images, args):
+    """并发调用 LLM 为所有图片生成描述（Semaphore 限制在途请求数）"""
+    from openai import AsyncOpenAI
+
+    client_kwargs = {"api_key": args.api_key}
+    if args.base_url:
+        client_kwargs["base_url"] = args.base_url
+
+    client = AsyncOpenAI(**client_kwargs)
+    semaphore = asyncio.Semaphore(max(1, args.max_concurrency))
+    prompt = args.prompt or DEFAULT_PROMPT
+
+    async def describe(blob, content_type):
+        b64 = base64.b64encode(blob).decode("ascii")
+        async with semaphore:
+            response = await client.chat.completions.create(
+                model=args.model,
+                messages=[
+                    {
+                        "role": "user",
+                        "content": [
+                            {"type": "text", "text": prompt},
+                            {
+                                "type": "image_url",
+                                "image_url": {
+                                    "url": f"data:{content_type};base64,{b64}"
+                                },
+                            },
+                        ],
+                    }
+                ],
+            )
+        return response.choices[0].message.content
+
+    async def describe_group(group):
+        """一次请求描述 K 张图片，JSON 对象按图片序号返回"""
+        content = [
+            {
+                "type": "text",
+                "text": (
+                    f"{prompt}\n\n"
+                    f"请为以下 {len(group)} 张图片分别生成描述，"
+                    f'以 JSON 对象返回，键为图片序号（"1" 到 "{len(group)}"），'
+                    f"值为对应图片的描述。"
+                ),
+            }
+        ]
+        for blob, content_type in group:
+            b64 = base64.b64encode(blob).decode("ascii")
+            content.append(
+                {
+                    "type": "image_url",
+                    "image_url": {"url": f"data:{content_type};base64,{b64}"},
+                }
+            )
+
+        async with semaphore:
+            response = await client.chat.completions.create(
+                model=args.model,
+                messages=[{"role": "user", "content": content}],
+                response_format={"type": "json_object"},
+            )
+
+        data = json.loads(response.choices[0].message.content)
+        return [str(data.get(str(pos), "(无描述)")) for pos in range(1, len(group) + 1)]
+
+    k = max(1, args.images_per_call)
+
+    try:
+        if k == 1:
+            return await asyncio.gather(
+                *(describe(blob, content_type) for _, _, blob, content_type in images)
+            )
+
+        # 每 K 张打包一次请求：请求数降为 N/K，共享提示词只计费一次
+        groups = [
+            [(blob, content_type) for _, _, blob, content_type in images[i : i + k]]
+            for i in range(0, len(images), k)
+        ]
+        grouped = await asyncio.gather(*(describe_group(g) for g in groups))
+        return [desc for group in grouped for desc in group]
+    finally:
+        await client.close()
+
+
+def convert_pptx_async(input_path, args):
+    """PPT 异步增强路径：结构转换与图片描述解耦
+
+    MarkItDown 对多图 PPT 逐张同步调用 LLM，请求串行排队；
+    这里先用 python-pptx 抽出全部图片，asyncio.gather 并发请求，
+    再把描述按幻灯片序号拼回 Markdown，墙钟时间约缩短为 1/并发数。
+
+    Returns:
+        str: Markdown 内容，无图片时返回 None（回退普通路径）
+    """
+    from markitdown import MarkItDown
+
+    images = extract_pptx_images(input_path)
+    if not images:
+        return None
+
+    print(f"🖼️  找到 {len(images)} 张图片，并发生成描述...", file=sys.stderr)
+
+    descriptions = dispatch_descriptions(images, args)
+
+    # 结构转换不挂 LLM，纯同步转换很快
+    markdown = MarkItDown().convert(input_path).text_content
+
+    parts = [markdown, "\n\n## 图片描述\n"]
+    for (slide_no, image_no, _, _), desc in zip(images, descriptions):
+        parts.append(f"\n### 幻灯片 {slide_no} - 图片 {image_no}\n\n{desc}\n")
+
+    return "".join(parts)
+
+
+def _describe_via_batch_api(images, args):
+    """通过 OpenAI Batch API 批量提交图片描述请求
+
+    同样的工作量走 Batch API 成本减半，且使用独立的限流池；
+    代价是回批延迟（官方 SLA 最长 24 小时），适合不赶时间的大 PPT。
+    """
+    client_kwargs = {"api_key": args.api_key}
+    if args.base_url:
+        client_kwargs["base_url"] = args.base_url
+
+    client = _make_client(tuple(sorted(client_kwargs.items())))
+    prompt = args.prompt or DEFAULT_PROMPT
+
+    # 每张图片一行请求，custom_id 用于回批时按序拼回
+    lines = []
+    for idx, (_, _, blob, content_type) in enumerate(images):
+        b64 = base64.b64encode(blob).decode("ascii")
+        lines.append(
+            json.dumps(
+                {
+                    "custom_id": str(idx),
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": args.model,
+                        "messages": [
+                            {
+                                "role": "user",
+                                "content": [
+                                    {"type": "text", "text": prompt},
+                                    {
+                                        "type": "image_url",
+                                        "image_url": {
+                                            "url": f"data:{content_type};base64,{b64}"
+                                        },
+                                    },
+                                ],
+                            }
+                        ],
+                    },
+                },
+                ensure_ascii=False,
+            )
+        )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        batch_input = Path(tmp_dir) / "batch_input.jsonl"
+        batch_input.write_bytes("\n".join(lines).encode("utf-8"))
+        with open(batch_input, "rb") as f:
+            input_file = client.files.create(file=f, purpose="batch")
+
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    print(f"📤 已提交 Batch 任务: {batch.id}", file=sys.stderr)
+
+    # 指数退避轮询，避免高频请求撞限流
+    delay = 5
+    while True:
+        batch = client.batches.retrieve(batch.id)
+        if batch.status == "completed":
+            break
+        if batch.status in ("failed", "expired", "cancelled"):
+            raise Exception(f"Batch 任务 {batch.status}")
+        print(f"⏳ Batch 状态: {batch.status}，{delay}s 后重试...", file=sys.stderr)
+        time.sleep(delay)
+        delay = min(delay * 2, 300)
+
+    content = client.files.content(batch.output_file_id).text
+
+    by_id = {}
+    for line in content.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        by_id[record["custom_id"]] = record["response"]["body"]["choices"][0][
+            "message"
+        ]["content"]
+
+    return [by_id.get(str(i), "(无描述)") for i in range(len(images))]
+
+
+def dispatch_descriptions(images, args):
+    """把图片列表派发给 LLM，返回与输入同序的描述列表"""
+    if args.batch_api:
+        return _describe_via_batch_api(images, args)
+    return asyncio.run(_describe_all(images, args))
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -55,6 +311,32 @@ def main():
         "--base-url", help="OpenAI API Base URL（可选，用于自定义端点）"
     )
 
+    parser.add_argument(
+        "--async-images",
+        action="store_true",
+        help="PPT 图片描述并发请求（需要 pip install python-pptx）",
+    )
+
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=8,
+        help="并发 LLM 请求数上限（默认: 8）",
+    )
+
+    parser.add_argument(
+        "--batch-api",
+        action="store_true",
+        help="图片描述走 OpenAI Batch API（成本减半，但需等待回批，最长 24h）",
+    )
+
+    parser.add_argument(
+        "--images-per-call",
+        type=int,
+        default=1,
+        help="每次 LLM 请求打包的图片数（>1 时要求模型按 JSON 返回，减少往返次数）",
+    )
+
     args = parser.parse_args()
 
     try:
@@ -81,57 +363,66 @@ def main():
         if response.lower() != "y":
             sys.exit(0)
 
-    # 初始化 OpenAI 客户端
-    print("🔄 初始化 OpenAI 客户端...", file=sys.stderr)
+    try:
+        markdown_content = None
 
-    client_kwargs = {"api_key": args.api_key}
+        # PPT 增强路径：图片描述并发请求 / Batch API
+        if (args.async_images or args.batch_api) and file_ext == ".pptx":
+            try:
+                print(f"📄 正在转换: {input_path}", file=sys.stderr)
+                markdown_content = convert_pptx_async(input_path, args)
+            except ImportError:
+                print(
+                    "⚠️  未找到 python-pptx，回退到普通转换路径", file=sys.stderr
+                )
 
-    if args.base_url:
-        client_kwargs["base_url"] = args.base_url
+        if markdown_content is None:
+            # 初始化 OpenAI 客户端
+            print("🔄 初始化 OpenAI 客户端...", file=sys.stderr)
 
-    try:
-        client = OpenAI(**client_kwargs)
-    except Exception as e:
-        print(f"❌ 错误: 无法初始化 OpenAI 客户端: {str(e)}", file=sys.stderr)
-        sys.exit(1)
+            client_kwargs = {"api_key": args.api_key}
 
-    # 初始化 MarkItDown with LLM
-    print(f"🔄 初始化转换器 (LLM: {args.model})...", file=sys.stderr)
+            if args.base_url:
+                client_kwargs["base_url"] = args.base_url
 
-    kwargs = {"llm_client": client, "llm_model": args.model}
+            client = _make_client(tuple(sorted(client_kwargs.items())))
 
-    if args.prompt:
-        kwargs["llm_prompt"] = args.prompt
+            # 初始化 MarkItDown with LLM
+            print(f"🔄 初始化转换器 (LLM: {args.model})...", file=sys.stderr)
 
-    md = MarkItDown(**kwargs)
+            kwargs = {"llm_client": client, "llm_model": args.model}
 
-    # 执行转换
-    print(f"📄 正在转换: {input_path}", file=sys.stderr)
-    print(f"🤖 使用 LLM 生成图片描述...", file=sys.stderr)
+            if args.prompt:
+                kwargs["llm_prompt"] = args.prompt
 
-    try:
-        result = md.convert(input_path)
-        markdown_content = result.text_content
+            md = MarkItDown(**kwargs)
+
+            # 执行转换
+            print(f"📄 正在转换: {input_path}", file=sys.stderr)
+            print(f"🤖 使用 LLM 生成图片描述...", file=sys.stderr)
+
+            result = md.convert(input_path)
+            markdown_content = result.text_content
 
         # 输出结果
+        content_length = len(markdown_content)
         if args.output:
             output_path = Path(args.output)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-
-            with open(output_path, "w", encoding="utf-8") as f:
-                f.write(markdown_content)
+            _write_markdown(output_path, markdown_content)
+            del markdown_content
 
             print(f"✅ 转换成功！", file=sys.stderr)
             print(f"📝 输出文件: {output_path}", file=sys.stderr)
-            print(f"📊 内容长度: {len(markdown_content)} 字符", file=sys.stderr)
+            print(f"📊 内容长度: {content_length} 字符", file=sys.stderr)
         else:
             # 输出到终端
             print("\n" + "=" * 60, file=sys.stderr)
             print("转换结果:", file=sys.stderr)
             print("=" * 60 + "\n", file=sys.stderr)
-            print(markdown_content)
+            sys.stdout.write(markdown_content)
+            sys.stdout.write("\n")
             print("\n" + "=" * 60, file=sys.stderr)
-            print(f"📊 内容长度: {len(markdown_content)} 字符", file=sys.stderr)
+            print(f"📊 内容长度: {content_length} 字符", file=sys.stderr)
 
     except Exception as e:
         print(f"❌ 转换失败: {str(e)}", file=sys.stderr)
@@ -6,43 +6,215 @@
 """
 
 import argparse
+import os
 import sys
-from datetime import datetime
-import yfinance as yf
-import pandas as pd
-import numpy as np
+from functools import lru_cache
+
+import yf_session
+from get_stock_data import load_cached_bars, save_cached_bars
+
+# yfinance/pandas/numpy 的导入要 1 秒左右，numba 更重，
+# 全部推迟到真正需要时再导入，--help 和参数错误可以立即返回
+
+
+@lru_cache(maxsize=1)
+def _bn():
+    """可选加速：bottleneck 的 move_mean/move_std 是紧凑的 C 循环，
+    绕过 pandas rolling 的逐窗口调度开销；未安装时返回 None"""
+    try:
+        import bottleneck
+    except ImportError:
+        return None
+    return bottleneck
+
+
+@lru_cache(maxsize=1)
+def _joblib():
+    """可选加速：joblib 线程池并发计算相互独立的指标；未安装时返回 None
+
+    指标的重活都在释放 GIL 的 pandas/NumPy C 代码里，线程足够。
+    """
+    try:
+        from joblib import Parallel, delayed
+    except ImportError:
+        return None
+    return Parallel, delayed
+
+
+# 短序列上线程池的调度开销会盖过收益
+_PARALLEL_MIN_ROWS = 10_000
+
+
+@lru_cache(maxsize=1)
+def _numba_kernels():
+    """可选加速：numba 把 RSI/ATR 的多步 pandas 链融合成单遍 C 循环，
+    不再物化 3-4 个中间数组；未安装时返回 None
+
+    惰性构建：只有第一次计算指标时才付出 numba 的导入/编译成本。
+
+    Returns:
+        tuple: (rsi_kernel, atr_kernel) 或 None
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+
+    import numpy as np
+
+    @njit(cache=True)
+    def rsi_kernel(close, window):
+        """单遍 RSI：滚动和增量更新，语义与 rolling(window).mean() 版本一致"""
+        n = close.shape[0]
+        out = np.full(n, np.nan)
+        gain_sum = 0.0
+        loss_sum = 0.0
+
+        for i in range(n):
+            delta = close[i] - close[i - 1] if i > 0 else 0.0
+            gain_sum += delta if delta > 0 else 0.0
+            loss_sum += -delta if delta < 0 else 0.0
+
+            if i >= window:
+                j = i - window
+                old = close[j] - close[j - 1] if j > 0 else 0.0
+                gain_sum -= old if old > 0 else 0.0
+                loss_sum -= -old if old < 0 else 0.0
+
+            if i >= window - 1:
+                avg_gain = gain_sum / window
+                avg_loss = loss_sum / window
+                if avg_loss > 0.0:
+                    rs = avg_gain / avg_loss
+                    out[i] = 100.0 - 100.0 / (1.0 + rs)
+                elif avg_gain > 0.0:
+                    out[i] = 100.0
+
+        return out
+
+    @njit(cache=True)
+    def atr_kernel(high, low, close, window):
+        """单遍 ATR：真实范围和滚动均值在同一循环内完成
+
+        首行没有前收盘价，真实范围退化为 high-low（与 pandas 路径的
+        跳 NaN 语义一致），因此首个有效输出在 window-1。
+        """
+        n = close.shape[0]
+        out = np.full(n, np.nan)
+        if n == 0:
+            return out
+
+        tr_sum = high[0] - low[0]
+        if window == 1:
+            out[0] = tr_sum
+
+        for i in range(1, n):
+            tr = max(
+                high[i] - low[i],
+                abs(high[i] - close[i - 1]),
+                abs(low[i] - close[i - 1]),
+            )
+            tr_sum += tr
+
+            if i >= window:
+                j = i - window
+                if j == 0:
+                    tr_sum -= high[0] - low[0]
+                else:
+                    tr_sum -= max(
+                        high[j] - low[j],
+                        abs(high[j] - close[j - 1]),
+                        abs(low[j] - close[j - 1]),
+                    )
+
+            if i >= window - 1:
+                out[i] = tr_sum / window
+
+        return out
+
+    return rsi_kernel, atr_kernel
+
+
+def _rolling_mean(series, window):
+    """滚动均值，优先走 bottleneck 的 C 实现"""
+    bn = _bn()
+    if bn is not None:
+        import numpy as np
+        import pandas as pd
+
+        arr = series.to_numpy(dtype=np.float64)
+        return pd.Series(bn.move_mean(arr, window, min_count=window), index=series.index)
+    return series.rolling(window=window).mean()
+
+
+def _rolling_std(series, window):
+    """滚动标准差（样本标准差，与 pandas 默认 ddof=1 一致）"""
+    bn = _bn()
+    if bn is not None:
+        import numpy as np
+        import pandas as pd
+
+        arr = series.to_numpy(dtype=np.float64)
+        return pd.Series(
+            bn.move_std(arr, window, min_count=window, ddof=1), index=series.index
+        )
+    return series.rolling(window=window).std()
 
 
 def calculate_sma(data, window):
     """计算简单移动平均线 (Simple Moving Average)"""
-    return data["Close"].rolling(window=window).mean()
+    return _rolling_mean(data["Close"], window)
 
 
-def calculate_ema(data, window):
+def _ema(close, window, cache=None):
+    """按 span 记忆化的 EMA：EMA/MACD 同时选中时 12/26 两条只各算一遍"""
+    if cache is None:
+        return close.ewm(span=window, adjust=False).mean()
+    if window not in cache:
+        cache[window] = close.ewm(span=window, adjust=False).mean()
+    return cache[window]
+
+
+def calculate_ema(data, window, cache=None):
     """计算指数移动平均线 (Exponential Moving Average)"""
-    return data["Close"].ewm(span=window, adjust=False).mean()
+    return _ema(data["Close"], window, cache)
 
 
 def calculate_rsi(data, window=14):
     """计算相对强弱指标 (Relative Strength Index)"""
-    delta = data["Close"].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-
-    rs = gain / loss
+    import numpy as np
+    import pandas as pd
+
+    close = data["Close"]
+
+    kernels = _numba_kernels()
+    if kernels is not None:
+        rsi_kernel, _ = kernels
+        return pd.Series(
+            rsi_kernel(close.to_numpy(dtype=np.float64), window), index=close.index
+        )
+
+    # clip 单遍完成正负拆分，不像布尔掩码那样额外物化一个 mask 数组
+    delta = close.diff().to_numpy(dtype=np.float64)
+    if delta.size:
+        delta[0] = 0.0  # diff 首元素是 NaN，clip 会原样保留
+    gain = pd.Series(np.clip(delta, 0.0, None), index=close.index)
+    loss = pd.Series(np.clip(-delta, 0.0, None), index=close.index)
+
+    rs = _rolling_mean(gain, window) / _rolling_mean(loss, window)
     rsi = 100 - (100 / (1 + rs))
     return rsi
 
 
-def calculate_macd(data, fast=12, slow=26, signal=9):
+def calculate_macd(data, fast=12, slow=26, signal=9, cache=None):
     """
     计算 MACD (Moving Average Convergence Divergence)
 
     Returns:
         tuple: (MACD线, 信号线, MACD柱)
     """
-    ema_fast = data["Close"].ewm(span=fast, adjust=False).mean()
-    ema_slow = data["Close"].ewm(span=slow, adjust=False).mean()
+    ema_fast = _ema(data["Close"], fast, cache)
+    ema_slow = _ema(data["Close"], slow, cache)
 
     macd_line = ema_fast - ema_slow
     signal_line = macd_line.ewm(span=signal, adjust=False).mean()
@@ -58,8 +230,8 @@ def calculate_bollinger_bands(data, window=20, num_std=2):
     Returns:
         tuple: (上轨, 中轨, 下轨)
     """
-    sma = data["Close"].rolling(window=window).mean()
-    std = data["Close"].rolling(window=window).std()
+    sma = _rolling_mean(data["Close"], window)
+    std = _rolling_std(data["Close"], window)
 
     upper_band = sma + (std * num_std)
     lower_band = sma - (std * num_std)
@@ -68,19 +240,76 @@ def calculate_bollinger_bands(data, window=20, num_std=2):
 
 
 def calculate_atr(data, window=14):
-    """计算平均真实范围 (Average True Range)"""
-    high_low = data["High"] - data["Low"]
-    high_close = np.abs(data["High"] - data["Close"].shift())
-    low_close = np.abs(data["Low"] - data["Close"].shift())
+    """计算平均真实范围 (Average True Range)
+
+    直接在 ndarray 上取三者逐元素最大值，
+    避免 pd.concat 把三列复制进新 DataFrame 再做逐行归约。
+    """
+    import numpy as np
+    import pandas as pd
+
+    high = data["High"].to_numpy(dtype=np.float64)
+    low = data["Low"].to_numpy(dtype=np.float64)
+
+    kernels = _numba_kernels()
+    if kernels is not None:
+        _, atr_kernel = kernels
+        close = data["Close"].to_numpy(dtype=np.float64)
+        return pd.Series(atr_kernel(high, low, close, window), index=data.index)
 
-    ranges = pd.concat([high_low, high_close, low_close], axis=1)
-    true_range = np.max(ranges, axis=1)
-    atr = true_range.rolling(window=window).mean()
+    prev_close = data["Close"].shift().to_numpy(dtype=np.float64)
+
+    true_range = np.maximum(
+        high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close))
+    )
+    # 首行没有前收盘价：np.maximum 会传播 NaN，而基线的 DataFrame.max
+    # 是跳 NaN 的，真实范围退化为 high-low
+    if true_range.size:
+        true_range[0] = high[0] - low[0]
+    atr = pd.Series(true_range, index=data.index).rolling(window=window).mean()
 
     return atr
 
 
-def analyze_stock(ticker, period="6mo", indicators=None):
+# 默认指标集，与 generate_signals 实际消费的指标组
+DEFAULT_INDICATORS = ("SMA", "EMA", "RSI", "MACD", "BB")
+SIGNAL_INDICATORS = frozenset(["SMA", "RSI", "MACD", "BB"])
+
+
+def signal_indicator_set(indicators):
+    """--signals-only 时的最小指标集
+
+    只保留 generate_signals 会消费的指标组，其余（EMA/ATR 等）
+    每个都是对 Close 的一次 O(N) 扫描，算了也不会被读。
+
+    Returns:
+        tuple: (过滤后的指标列表, 跳过的指标数)
+    """
+    requested = list(indicators) if indicators is not None else list(DEFAULT_INDICATORS)
+    needed = [i for i in requested if i in SIGNAL_INDICATORS]
+    return needed, len(requested) - len(needed)
+
+
+def downcast_ohlcv(data):
+    """把价格列降到 float32
+
+    价格只有约 6 位有效数字，float64 白白占一倍内存带宽，
+    而滚动统计都是带宽受限的——降精度后每次扫描快约一倍。
+    """
+    cols = {c: "float32" for c in ("Open", "High", "Low", "Close") if c in data.columns}
+    return data.astype(cols) if cols else data
+
+
+def analyze_stock(
+    ticker,
+    period="6mo",
+    indicators=None,
+    session=None,
+    cache_dir=None,
+    cache_ttl=3600,
+    signals_only=False,
+    fp64=False,
+):
     """
     对股票进行技术分析
 
@@ -88,57 +317,110 @@ def analyze_stock(ticker, period="6mo", indicators=None):
         ticker: 股票代码
         period: 分析周期
         indicators: 要计算的指标列表
+        session: 共享 HTTP 会话（可选）
+        cache_dir: 本地 Parquet 行情缓存目录（可选）
+        cache_ttl: 行情缓存有效秒数
+        signals_only: 仅计算信号所需指标（跳过 SMA_200 等展示用列）
 
     Returns:
         DataFrame: 包含技术指标的数据
     """
     try:
-        # 获取历史数据
-        stock = yf.Ticker(ticker)
-        data = stock.history(period=period)
-
-        if data.empty:
-            print(f"❌ 未找到股票 {ticker} 的数据", file=sys.stderr)
-            return None
+        data = None
+        if cache_dir:
+            data = load_cached_bars(cache_dir, ticker, period, "1d", cache_ttl)
 
-        # 计算技术指标
-        if indicators is None:
-            indicators = ["SMA", "EMA", "RSI", "MACD", "BB"]
+        if data is None:
+            import yfinance as yf
 
-        if "SMA" in indicators:
-            data["SMA_20"] = calculate_sma(data, 20)
-            data["SMA_50"] = calculate_sma(data, 50)
-            data["SMA_200"] = calculate_sma(data, 200)
+            # 获取历史数据
+            stock = yf.Ticker(ticker, session=session)
+            data = stock.history(period=period)
 
-        if "EMA" in indicators:
-            data["EMA_12"] = calculate_ema(data, 12)
-            data["EMA_26"] = calculate_ema(data, 26)
+            if data.empty:
+                print(f"❌ 未找到股票 {ticker} 的数据", file=sys.stderr)
+                return None
 
-        if "RSI" in indicators:
-            data["RSI"] = calculate_rsi(data)
+            if cache_dir:
+                save_cached_bars(cache_dir, ticker, period, "1d", data)
 
-        if "MACD" in indicators:
-            macd, signal, histogram = calculate_macd(data)
-            data["MACD"] = macd
-            data["MACD_Signal"] = signal
-            data["MACD_Histogram"] = histogram
+        if not fp64:
+            data = downcast_ohlcv(data)
 
-        if "BB" in indicators:
-            upper, middle, lower = calculate_bollinger_bands(data)
-            data["BB_Upper"] = upper
-            data["BB_Middle"] = middle
-            data["BB_Lower"] = lower
-
-        if "ATR" in indicators:
-            data["ATR"] = calculate_atr(data)
-
-        return data
+        return compute_indicators(data, indicators, signals_only)
 
     except Exception as e:
         print(f"❌ 分析失败: {str(e)}", file=sys.stderr)
         return None
 
 
+def compute_indicators(data, indicators=None, signals_only=False):
+    """在已有行情数据上计算技术指标（就地添加指标列）"""
+    if indicators is None:
+        indicators = list(DEFAULT_INDICATORS)
+
+    # EMA/MACD 共享按 span 缓存的 EMA，避免 12/26 两条各算两遍
+    ema_cache = {}
+
+    # 每个指标组是一个独立任务，返回 {列名: Series}
+    def _sma_cols(d):
+        cols = {"SMA_20": calculate_sma(d, 20), "SMA_50": calculate_sma(d, 50)}
+        # SMA_200 仅用于展示，信号模式跳过
+        if not signals_only:
+            cols["SMA_200"] = calculate_sma(d, 200)
+        return cols
+
+    def _ema_cols(d):
+        return {
+            "EMA_12": calculate_ema(d, 12, ema_cache),
+            "EMA_26": calculate_ema(d, 26, ema_cache),
+        }
+
+    def _rsi_cols(d):
+        return {"RSI": calculate_rsi(d)}
+
+    def _macd_cols(d):
+        macd, signal, histogram = calculate_macd(d, cache=ema_cache)
+        return {"MACD": macd, "MACD_Signal": signal, "MACD_Histogram": histogram}
+
+    def _bb_cols(d):
+        upper, middle, lower = calculate_bollinger_bands(d)
+        return {"BB_Upper": upper, "BB_Middle": middle, "BB_Lower": lower}
+
+    def _atr_cols(d):
+        return {"ATR": calculate_atr(d)}
+
+    tasks = []
+    if "SMA" in indicators:
+        tasks.append(_sma_cols)
+    if "EMA" in indicators:
+        tasks.append(_ema_cols)
+    if "RSI" in indicators:
+        tasks.append(_rsi_cols)
+    if "MACD" in indicators:
+        tasks.append(_macd_cols)
+    if "BB" in indicators:
+        tasks.append(_bb_cols)
+    if "ATR" in indicators:
+        tasks.append(_atr_cols)
+
+    jb = _joblib()
+    if jb is not None and len(tasks) > 1 and len(data) >= _PARALLEL_MIN_ROWS:
+        Parallel, delayed = jb
+        results = Parallel(
+            n_jobs=min(len(tasks), os.cpu_count() or 1), prefer="threads"
+        )(delayed(task)(data) for task in tasks)
+    else:
+        results = [task(data) for task in tasks]
+
+    # 统一按任务顺序回填，保持列顺序与串行版本一致
+    for cols in results:
+        for name, series in cols.items():
+            data[name] = series
+
+    return data
+
+
 def generate_signals(data):
     """
     生成交易信号
@@ -147,8 +429,10 @@ def generate_signals(data):
         dict: 当前的技术信号
     """
     signals = {}
-    latest = data.iloc[-1]
-    prev = data.iloc[-2]
+    # 一次性把最后两行取成普通 dict：之后的每次取值都是 O(1) 哈希查找，
+    # 而不是 pandas Series 的标签定位；在整个观察列表上循环调用时差距明显
+    rows = data.tail(2).to_dict("records")
+    prev, latest = rows[0], rows[1]
 
     # 趋势信号（基于移动平均线）
     if "SMA_20" in data.columns and "SMA_50" in data.columns:
@@ -202,29 +486,52 @@ def generate_signals(data):
     return signals
 
 
-def main():
-    parser = argparse.ArgumentParser(description="股票技术分析")
-    parser.add_argument("--ticker", required=True, help="股票代码")
-    parser.add_argument("--period", default="6mo", help="分析周期（默认: 6mo）")
-    parser.add_argument(
-        "--indicators",
-        nargs="+",
-        choices=["SMA", "EMA", "RSI", "MACD", "BB", "ATR"],
-        help="要计算的指标（默认: SMA EMA RSI MACD BB）",
-    )
-    parser.add_argument("--output", help="输出文件路径（CSV 格式）")
-    parser.add_argument("--signals-only", action="store_true", help="仅显示交易信号")
+def analyze_many(
+    tickers, period="6mo", indicators=None, session=None, signals_only=False, fp64=False
+):
+    """
+    一次调用并发获取多只股票并计算指标
 
-    args = parser.parse_args()
+    yf.download(threads=True) 在内部并发抓取全部代码，
+    比逐只 Ticker.history 快得多。
 
-    print(f"\n📊 股票技术分析: {args.ticker}")
-    print("=" * 60)
+    Returns:
+        dict: {ticker: DataFrame}
+    """
+    import yfinance as yf
 
-    # 进行分析
-    data = analyze_stock(args.ticker, args.period, args.indicators)
+    try:
+        data_all = yf.download(
+            tickers,
+            period=period,
+            group_by="ticker",
+            threads=True,
+            progress=False,
+            session=session,
+        )
+    except Exception as e:
+        print(f"❌ 分析失败: {str(e)}", file=sys.stderr)
+        return {}
 
-    if data is None:
-        return
+    results = {}
+    for ticker in tickers:
+        if ticker not in data_all.columns.get_level_values(0):
+            print(f"❌ 未找到股票 {ticker} 的数据", file=sys.stderr)
+            continue
+        data = data_all[ticker].dropna(how="all")
+        if data.empty:
+            print(f"❌ 未找到股票 {ticker} 的数据", file=sys.stderr)
+            continue
+        if not fp64:
+            data = downcast_ohlcv(data)
+        results[ticker] = compute_indicators(data, indicators, signals_only)
+
+    return results
+
+
+def _print_report(data, args, output=None):
+    """打印单只股票的分析报告"""
+    import pandas as pd
 
     print(
         f"\n数据周期: {data.index[0].strftime('%Y-%m-%d')} 至 {data.index[-1].strftime('%Y-%m-%d')}"
@@ -263,9 +570,107 @@ def main():
     print(data[columns_to_show].tail(5).to_string())
 
     # 保存到文件
-    if args.output:
-        data.to_csv(args.output)
-        print(f"\n✅ 完整数据已保存到: {args.output}")
+    if output:
+        data.to_csv(output)
+        print(f"\n✅ 完整数据已保存到: {output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="股票技术分析")
+    parser.add_argument(
+        "--ticker",
+        required=True,
+        help="股票代码，可用逗号分隔多个（例如: AAPL 或 AAPL,MSFT）",
+    )
+    parser.add_argument("--period", default="6mo", help="分析周期（默认: 6mo）")
+    parser.add_argument(
+        "--indicators",
+        nargs="+",
+        choices=["SMA", "EMA", "RSI", "MACD", "BB", "ATR"],
+        help="要计算的指标（默认: SMA EMA RSI MACD BB）",
+    )
+    parser.add_argument("--output", help="输出文件路径（CSV 格式）")
+    parser.add_argument("--signals-only", action="store_true", help="仅显示交易信号")
+    parser.add_argument(
+        "--no-cache", action="store_true", help="跳过 HTTP 缓存，强制从网络获取"
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=int,
+        default=3600,
+        help="HTTP 缓存有效秒数（默认: 3600）",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="本地 Parquet 行情缓存目录（按 ticker/period/interval 建键，mtime 过期）",
+    )
+    parser.add_argument(
+        "--fp64",
+        action="store_true",
+        help="保持 float64 精度计算指标（默认降到 float32 以减半内存带宽）",
+    )
+
+    args = parser.parse_args()
+
+    session = yf_session.get_session(not args.no_cache, args.cache_ttl)
+
+    tickers = [t.strip() for t in args.ticker.split(",") if t.strip()]
+
+    # 信号模式只计算 generate_signals 实际消费的指标
+    indicators = args.indicators
+    if args.signals_only:
+        indicators, skipped = signal_indicator_set(indicators)
+        if skipped:
+            print(f"⏭️  信号模式跳过 {skipped} 个指标", file=sys.stderr)
+
+    # 多标的：一次 yf.download 并发抓取后逐只分析
+    if len(tickers) > 1:
+        results = analyze_many(
+            tickers,
+            args.period,
+            indicators,
+            session=session,
+            signals_only=args.signals_only,
+            fp64=args.fp64,
+        )
+
+        for tkr in tickers:
+            if tkr not in results:
+                continue
+
+            print(f"\n📊 股票技术分析: {tkr}")
+            print("=" * 60)
+
+            output = None
+            if args.output:
+                stem, dot, ext = args.output.rpartition(".")
+                output = f"{stem}_{tkr}.{ext}" if dot else f"{args.output}_{tkr}"
+
+            _print_report(results[tkr], args, output)
+
+        print("\n⚠️  免责声明: 技术分析仅供参考，不构成投资建议")
+        print("=" * 60)
+        return
+
+    print(f"\n📊 股票技术分析: {args.ticker}")
+    print("=" * 60)
+
+    # 进行分析
+    data = analyze_stock(
+        args.ticker,
+        args.period,
+        indicators,
+        session=session,
+        cache_dir=args.cache_dir,
+        cache_ttl=args.cache_ttl,
+        signals_only=args.signals_only,
+        fp64=args.fp64,
+    )
+
+    if data is None:
+        return
+
+    _print_report(data, args, args.output)
 
     print("\n⚠️  免责声明: 技术分析仅供参考，不构成投资建议")
     print("=" * 60)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+金融数据磁盘缓存
+
+将财务报表 DataFrame 按键值缓存到 .cache/ 目录，带 TTL 过期控制。
+同一标的的重复查询直接读磁盘（毫秒级），避免多秒的 HTTPS 请求。
+
+数据以 parquet 存储（比 pickle/CSV 更快更小），旁边的 .meta.json 记录写入时间等元数据。
+"""
+
+import hashlib
+import time
+from pathlib import Path
+
+# orjson 是 Rust 扩展，序列化比标准库快 5-10 倍；未安装时回退到标准库
+try:
+    import orjson as _orjson
+
+    _dumps = _orjson.dumps
+    _loads = _orjson.loads
+except ImportError:
+    import json as _json
+
+    def _dumps(obj):
+        return _json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    _loads = _json.loads
+
+CACHE_DIR = Path(__file__).parent / ".cache"
+
+
+def _paths(key: str):
+    """计算缓存键对应的数据文件和元数据文件路径"""
+    digest = hashlib.md5(key.encode("utf-8")).hexdigest()
+    return CACHE_DIR / f"{digest}.parquet", CACHE_DIR / f"{digest}.meta.json"
+
+
+def get(key: str, ttl_seconds: float):
+    """读取缓存的 DataFrame，不存在或已过期时返回 None"""
+    import pandas as pd
+
+    data_path, meta_path = _paths(key)
+    if not data_path.exists() or not meta_path.exists():
+        return None
+
+    try:
+        meta = _loads(meta_path.read_bytes())
+        if time.time() - meta["ts"] > ttl_seconds:
+            return None
+        return pd.read_parquet(data_path)
+    except Exception:
+        # 缓存损坏时当作未命中，回退到网络获取
+        return None
+
+
+def set(key: str, df) -> None:
+    """写入 DataFrame 缓存（parquet + 元数据 sidecar）"""
+    data_path, meta_path = _paths(key)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # parquet 要求字符串列名，财务报表的列是日期
+        df = df.copy()
+        df.columns = [str(c) for c in df.columns]
+        df.to_parquet(data_path)
+        meta_path.write_bytes(_dumps({"ts": time.time(), "key": key}))
+    except Exception:
+        # 缓存写入失败不影响主流程
+        pass
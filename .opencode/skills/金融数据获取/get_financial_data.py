@@ -7,11 +7,52 @@
 
 import argparse
 import sys
-import yfinance as yf
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+
+import cache
+
+# yfinance/pandas 的导入要 1 秒左右，推迟到真正需要时再导入，
+# --help 和参数错误可以立即返回
+
+
+@lru_cache(maxsize=1)
+def _session():
+    """共享 requests.Session：连接池复用 TLS 握手和 DNS 查询"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3),
+        ),
+    )
+    return session
+
+
+@lru_cache(maxsize=128)
+def _ticker(symbol):
+    """共享 Ticker 实例：yfinance 内部按实例缓存响应，复用可避免重复 HTTP 请求"""
+    import yfinance as yf
+
+    return yf.Ticker(symbol, session=_session())
 
 
-def get_financial_statements(ticker, statement_type, annual=False):
+_STATEMENT_TITLES = {
+    "income": "利润表 (Income Statement)",
+    "balance": "资产负债表 (Balance Sheet)",
+    "cashflow": "现金流量表 (Cash Flow Statement)",
+}
+
+
+def get_financial_statements(
+    ticker, statement_type, annual=False, use_cache=True, ttl_days=None
+):
     """
     获取财务报表
 
@@ -19,30 +60,46 @@ def get_financial_statements(ticker, statement_type, annual=False):
         ticker: 股票代码
         statement_type: 报表类型 ('income', 'balance', 'cashflow')
         annual: 是否获取年度报表（默认为季度报表）
+        use_cache: 是否使用磁盘缓存
+        ttl_days: 缓存有效天数（默认：季度 1 天，年度 90 天）
 
     Returns:
         DataFrame: 财务报表数据
     """
+    if statement_type not in _STATEMENT_TITLES:
+        print(f"❌ 无效的报表类型: {statement_type}", file=sys.stderr)
+        return None, None
+
+    title = _STATEMENT_TITLES[statement_type]
+
+    # 磁盘缓存：年度报表变化慢，默认 TTL 更长
+    cache_key = f"{ticker}|{statement_type}|{annual}"
+    if ttl_days is None:
+        ttl_days = 90 if annual else 1
+    ttl_seconds = ttl_days * 86400
+
+    if use_cache:
+        df = cache.get(cache_key, ttl_seconds)
+        if df is not None and not df.empty:
+            return df, title
+
     try:
-        stock = yf.Ticker(ticker)
+        stock = _ticker(ticker)
 
         if statement_type == "income":
             df = stock.financials if annual else stock.quarterly_financials
-            title = "利润表 (Income Statement)"
         elif statement_type == "balance":
             df = stock.balance_sheet if annual else stock.quarterly_balance_sheet
-            title = "资产负债表 (Balance Sheet)"
-        elif statement_type == "cashflow":
-            df = stock.cashflow if annual else stock.quarterly_cashflow
-            title = "现金流量表 (Cash Flow Statement)"
         else:
-            print(f"❌ 无效的报表类型: {statement_type}", file=sys.stderr)
-            return None, None
+            df = stock.cashflow if annual else stock.quarterly_cashflow
 
         if df is None or df.empty:
             print(f"❌ 未找到 {ticker} 的财务数据", file=sys.stderr)
             return None, None
 
+        if use_cache:
+            cache.set(cache_key, df)
+
         return df, title
 
     except Exception as e:
@@ -50,19 +107,36 @@ def get_financial_statements(ticker, statement_type, annual=False):
         return None, None
 
 
+# 比例类指标集合：O(1) 哈希查找代替每个键 4 次子串扫描
+PERCENT_METRIC_KEYS = frozenset(
+    [
+        "毛利率 (Gross Margin)",
+        "营业利润率 (Operating Margin)",
+        "净利率 (Profit Margin)",
+        "资产收益率 (ROA)",
+        "股东权益报酬率 (ROE)",
+    ]
+)
+
+# (阈值, 除数, 后缀)，按量级从大到小匹配
+_MAGNITUDES = (
+    (1_000_000_000, 1_000_000_000, "B"),
+    (1_000_000, 1_000_000, "M"),
+    (1_000, 1_000, "K"),
+)
+
+
 def format_financial_value(value):
     """格式化财务数值"""
-    if pd.isna(value):
+    # 不依赖 pandas 的 NaN 判断（NaN != NaN）
+    if value is None or (isinstance(value, float) and value != value):
         return "N/A"
     if isinstance(value, (int, float)):
-        if abs(value) >= 1_000_000_000:
-            return f"{value / 1_000_000_000:.2f}B"
-        elif abs(value) >= 1_000_000:
-            return f"{value / 1_000_000:.2f}M"
-        elif abs(value) >= 1_000:
-            return f"{value / 1_000:.2f}K"
-        else:
-            return f"{value:.2f}"
+        abs_value = abs(value)
+        for threshold, divisor, suffix in _MAGNITUDES:
+            if abs_value >= threshold:
+                return f"{value / divisor:.2f}{suffix}"
+        return f"{value:.2f}"
     return str(value)
 
 
@@ -77,7 +151,7 @@ def get_key_metrics(ticker):
         dict: 关键指标
     """
     try:
-        stock = yf.Ticker(ticker)
+        stock = _ticker(ticker)
         info = stock.info
 
         metrics = {
@@ -105,10 +179,62 @@ def get_key_metrics(ticker):
         return None
 
 
+def _fetch_all(ticker, statements, args):
+    """获取单个标的的全部数据，供线程池 worker 调用
+
+    Returns:
+        tuple: (关键指标 dict 或 None, [(报表类型, DataFrame, 标题), ...])
+    """
+    metrics = get_key_metrics(ticker) if args.metrics else None
+
+    statement_results = []
+    for stmt in statements:
+        df, title = get_financial_statements(
+            ticker,
+            stmt,
+            args.annual,
+            use_cache=not args.no_cache,
+            ttl_days=args.ttl_days,
+        )
+        statement_results.append((stmt, df, title))
+
+    return metrics, statement_results
+
+
+def _save_statement(df, prefix, stmt, args):
+    """保存报表到文件，返回输出路径
+
+    CSV 写出是逐单元格的纯 Python 格式化，宽报表很慢；
+    parquet/feather 走 Arrow 的 C++ 写入，快一个量级且文件更小。
+    """
+    fmt = args.format
+    if fmt == "auto":
+        fmt = "parquet" if df.size > 100 else "csv"
+
+    period = "annual" if args.annual else "quarterly"
+    output_file = f"{prefix}_{stmt}_{period}.{fmt}"
+
+    if fmt == "csv":
+        df.to_csv(output_file)
+    else:
+        # Arrow 格式要求字符串列名，财务报表的列是日期
+        out = df.copy()
+        out.columns = [str(c) for c in out.columns]
+        if fmt == "parquet":
+            out.to_parquet(output_file, compression="zstd")
+        else:
+            # feather 不保留索引，先转成普通列
+            out.reset_index().to_feather(output_file)
+
+    return output_file
+
+
 def main():
     parser = argparse.ArgumentParser(description="获取公司财务报表数据")
     parser.add_argument(
-        "--ticker", required=True, help="股票代码（例如: AAPL, 0700.HK）"
+        "--ticker",
+        required=True,
+        help="股票代码，可用逗号分隔多个（例如: AAPL 或 AAPL,MSFT,GOOG）",
     )
     parser.add_argument(
         "--statement",
@@ -120,36 +246,33 @@ def main():
         "--annual", action="store_true", help="获取年度报表（默认为季度报表）"
     )
     parser.add_argument("--metrics", action="store_true", help="显示关键财务指标")
-    parser.add_argument("--output", help="输出文件路径前缀（CSV 格式）")
+    parser.add_argument("--output", help="输出文件路径前缀")
+    parser.add_argument(
+        "--format",
+        choices=["auto", "csv", "parquet", "feather"],
+        default="auto",
+        help="输出格式（默认 auto：大报表用 parquet，小报表用 csv）",
+    )
+    parser.add_argument(
+        "--no-transpose",
+        action="store_true",
+        help="按原始方向显示报表（跳过转置，宽报表更快）",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="跳过磁盘缓存，强制从网络获取"
+    )
+    parser.add_argument(
+        "--ttl-days",
+        type=float,
+        help="缓存有效天数（默认：季度 1 天，年度 90 天）",
+    )
 
     args = parser.parse_args()
 
-    print(f"\n📊 获取财务数据: {args.ticker}")
-    print("=" * 80)
+    tickers = [t.strip() for t in args.ticker.split(",") if t.strip()]
 
     period_type = "年度" if args.annual else "季度"
 
-    # 获取关键指标
-    if args.metrics:
-        print(f"\n📈 关键财务指标:")
-        metrics = get_key_metrics(args.ticker)
-        if metrics:
-            for key, value in metrics.items():
-                if (
-                    isinstance(value, float)
-                    and "Rate" not in key
-                    and "Margin" not in key
-                    and "ROA" not in key
-                    and "ROE" not in key
-                ):
-                    print(f"   {key}: {format_financial_value(value)}")
-                elif isinstance(value, float) and (
-                    "Rate" in key or "Margin" in key or "ROA" in key or "ROE" in key
-                ):
-                    print(f"   {key}: {value * 100:.2f}%")
-                else:
-                    print(f"   {key}: {value}")
-
     # 获取财务报表
     statements = (
         ["income", "balance", "cashflow"]
@@ -157,26 +280,59 @@ def main():
         else [args.statement]
     )
 
-    for stmt in statements:
-        df, title = get_financial_statements(args.ticker, stmt, args.annual)
-
-        if df is not None:
-            print(f"\n{title} ({period_type}):")
-            print("-" * 80)
-
-            # 转置数据框以便更好地显示
-            df_display = df.T
-
-            # 显示数据
-            print(df_display.to_string())
+    # 并发获取所有标的（网络等待期间 yfinance 会释放 GIL，线程池扩展性好）
+    fetched = {}
+    if len(tickers) == 1:
+        fetched[tickers[0]] = _fetch_all(tickers[0], statements, args)
+    else:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = {
+                executor.submit(_fetch_all, tkr, statements, args): tkr
+                for tkr in tickers
+            }
+            for future in as_completed(futures):
+                fetched[futures[future]] = future.result()
+
+    # 按输入顺序串行输出，保持 stdout 有序
+    for tkr in tickers:
+        metrics, statement_results = fetched[tkr]
+
+        print(f"\n📊 获取财务数据: {tkr}")
+        print("=" * 80)
+
+        # 显示关键指标
+        if args.metrics:
+            print(f"\n📈 关键财务指标:")
+            if metrics:
+                for key, value in metrics.items():
+                    if not isinstance(value, float):
+                        print(f"   {key}: {value}")
+                    elif key in PERCENT_METRIC_KEYS:
+                        print(f"   {key}: {value * 100:.2f}%")
+                    else:
+                        print(f"   {key}: {format_financial_value(value)}")
+
+        for stmt, df, title in statement_results:
+            if df is not None:
+                print(f"\n{title} ({period_type}):")
+                print("-" * 80)
+
+                # 默认转置以便阅读（日期为行）；--no-transpose 跳过转置，
+                # 宽报表的转置会新建 BlockManager 并翻转内存布局
+                if args.no_transpose:
+                    print(df.to_string())
+                else:
+                    print(df.T.to_string())
 
-            # 保存到文件
-            if args.output:
-                output_file = f"{args.output}_{stmt}_{'annual' if args.annual else 'quarterly'}.csv"
-                df.to_csv(output_file)
-                print(f"\n✅ 数据已保存到: {output_file}")
+                # 保存到文件
+                if args.output:
+                    prefix = (
+                        f"{args.output}_{tkr}" if len(tickers) > 1 else args.output
+                    )
+                    output_file = _save_statement(df, prefix, stmt, args)
+                    print(f"\n✅ 数据已保存到: {output_file}")
 
-    print("\n" + "=" * 80)
+        print("\n" + "=" * 80)
 
 
 if __name__ == "__main__":
@@ -8,22 +8,29 @@
 import argparse
 import sys
 from datetime import datetime
-import yfinance as yf
 
+import yf_session
 
-def get_market_info(ticker, detailed=False):
+# yfinance 的导入要 1 秒左右，推迟到真正需要时再导入，
+# --help 和 --list-indices 可以立即返回
+
+
+def get_market_info(ticker, detailed=False, session=None):
     """
     获取市场信息
 
     Args:
         ticker: 股票代码或指数代码
         detailed: 是否显示详细信息
+        session: 共享 HTTP 会话（可选）
 
     Returns:
         dict: 市场信息
     """
     try:
-        stock = yf.Ticker(ticker)
+        import yfinance as yf
+
+        stock = yf.Ticker(ticker, session=session)
         info = stock.info
 
         if not info:
@@ -108,19 +115,24 @@ def get_market_info(ticker, detailed=False):
         return None
 
 
+# (阈值, 除数, 后缀)，按量级从大到小匹配
+_MAGNITUDES = (
+    (1_000_000_000, 1_000_000_000, "B"),
+    (1_000_000, 1_000_000, "M"),
+    (1_000, 1_000, "K"),
+)
+
+
 def format_value(value):
     """格式化显示值"""
     if isinstance(value, (int, float)):
-        if abs(value) >= 1_000_000_000:
-            return f"{value / 1_000_000_000:.2f}B"
-        elif abs(value) >= 1_000_000:
-            return f"{value / 1_000_000:.2f}M"
-        elif abs(value) >= 1_000:
-            return f"{value / 1_000:.2f}K"
-        elif abs(value) < 1 and value != 0:
+        abs_value = abs(value)
+        for threshold, divisor, suffix in _MAGNITUDES:
+            if abs_value >= threshold:
+                return f"{value / divisor:.2f}{suffix}"
+        if abs_value < 1 and value != 0:
             return f"{value:.4f}"
-        else:
-            return f"{value:.2f}"
+        return f"{value:.2f}"
     return value
 
 
@@ -166,6 +178,15 @@ def main():
     parser.add_argument("--ticker", help="股票代码或指数代码（例如: AAPL, ^GSPC）")
     parser.add_argument("--info", action="store_true", help="显示详细信息")
     parser.add_argument("--list-indices", action="store_true", help="列出常用市场指数")
+    parser.add_argument(
+        "--no-cache", action="store_true", help="跳过 HTTP 缓存，强制从网络获取"
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=int,
+        default=3600,
+        help="HTTP 缓存有效秒数（默认: 3600）",
+    )
 
     args = parser.parse_args()
 
@@ -187,7 +208,8 @@ def main():
     print("=" * 60)
     print(f"查询时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
-    info = get_market_info(args.ticker, detailed=args.info)
+    session = yf_session.get_session(not args.no_cache, args.cache_ttl)
+    info = get_market_info(args.ticker, detailed=args.info, session=session)
 
     if info:
         print_market_info(info)
@@ -7,12 +7,57 @@
 
 import argparse
 import sys
-from datetime import datetime
-import yfinance as yf
-import pandas as pd
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
+import yf_session
 
-def get_stock_data(ticker, period="1mo", interval="1d", start=None, end=None):
+# yfinance/pandas 的导入要 1 秒左右，推迟到真正需要时再导入，
+# --help 和参数错误可以立即返回
+
+
+def load_cached_bars(cache_dir, ticker, period, interval, ttl_seconds):
+    """读取本地 Parquet 行情缓存
+
+    Parquet 读取比 CSV 解析快一个量级且零网络延迟；
+    过期（mtime 超过 ttl）、缺失或损坏时返回 None。
+    """
+    path = Path(cache_dir) / f"{ticker}_{period}_{interval}.parquet"
+    try:
+        if time.time() - path.stat().st_mtime >= ttl_seconds:
+            return None
+
+        import pandas as pd
+
+        df = pd.read_parquet(path)
+        return df if not df.empty else None
+    except (OSError, ValueError):
+        return None
+
+
+def save_cached_bars(cache_dir, ticker, period, interval, df):
+    """把行情写入 Parquet 缓存（缓存失败不影响主流程）"""
+    try:
+        cache_dir = Path(cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(
+            cache_dir / f"{ticker}_{period}_{interval}.parquet", compression="snappy"
+        )
+    except Exception:
+        pass
+
+
+def get_stock_data(
+    ticker,
+    period="1mo",
+    interval="1d",
+    start=None,
+    end=None,
+    session=None,
+    cache_dir=None,
+    cache_ttl=3600,
+):
     """
     获取股票历史数据
 
@@ -27,7 +72,17 @@ def get_stock_data(ticker, period="1mo", interval="1d", start=None, end=None):
         DataFrame: 股票历史数据
     """
     try:
-        stock = yf.Ticker(ticker)
+        # 本地 Parquet 缓存只按 (ticker, period, interval) 建键，
+        # 显式日期区间的查询不走缓存
+        use_bars_cache = cache_dir and not (start and end)
+        if use_bars_cache:
+            hist = load_cached_bars(cache_dir, ticker, period, interval, cache_ttl)
+            if hist is not None:
+                return hist
+
+        import yfinance as yf
+
+        stock = yf.Ticker(ticker, session=session)
 
         # 获取历史数据
         if start and end:
@@ -39,6 +94,9 @@ def get_stock_data(ticker, period="1mo", interval="1d", start=None, end=None):
             print(f"❌ 未找到股票 {ticker} 的数据", file=sys.stderr)
             return None
 
+        if use_bars_cache:
+            save_cached_bars(cache_dir, ticker, period, interval, hist)
+
         return hist
 
     except Exception as e:
@@ -46,18 +104,21 @@ def get_stock_data(ticker, period="1mo", interval="1d", start=None, end=None):
         return None
 
 
-def get_stock_info(ticker):
+def get_stock_info(ticker, session=None):
     """
     获取股票基本信息
 
     Args:
         ticker: 股票代码
+        session: 共享 HTTP 会话（可选）
 
     Returns:
         dict: 股票信息
     """
     try:
-        stock = yf.Ticker(ticker)
+        import yfinance as yf
+
+        stock = yf.Ticker(ticker, session=session)
         info = stock.info
 
         # 提取关键信息
@@ -84,24 +145,112 @@ def get_stock_info(ticker):
         return None
 
 
+def get_many_stock_data(
+    tickers, period="1mo", interval="1d", start=None, end=None, session=None
+):
+    """
+    一次调用并发获取多只股票的历史数据
+
+    yf.download(threads=True) 在内部并发抓取全部代码，
+    比逐只启动请求（更不用说逐只启动进程）快得多。
+
+    Returns:
+        dict: {ticker: DataFrame}
+    """
+    import yfinance as yf
+
+    try:
+        if start and end:
+            data = yf.download(
+                tickers,
+                start=start,
+                end=end,
+                interval=interval,
+                group_by="ticker",
+                threads=True,
+                progress=False,
+                session=session,
+            )
+        else:
+            data = yf.download(
+                tickers,
+                period=period,
+                interval=interval,
+                group_by="ticker",
+                threads=True,
+                progress=False,
+                session=session,
+            )
+    except Exception as e:
+        print(f"❌ 获取数据失败: {str(e)}", file=sys.stderr)
+        return {}
+
+    results = {}
+    for ticker in tickers:
+        if ticker not in data.columns.get_level_values(0):
+            print(f"❌ 未找到股票 {ticker} 的数据", file=sys.stderr)
+            continue
+        hist = data[ticker].dropna(how="all")
+        if hist.empty:
+            print(f"❌ 未找到股票 {ticker} 的数据", file=sys.stderr)
+            continue
+        results[ticker] = hist
+
+    return results
+
+
+# (阈值, 除数, 后缀)，按量级从大到小匹配
+_MAGNITUDES = (
+    (1_000_000_000, 1_000_000_000, "B"),
+    (1_000_000, 1_000_000, "M"),
+    (1_000, 1_000, "K"),
+)
+
+
 def format_number(num):
     """格式化数字显示"""
     if isinstance(num, (int, float)):
-        if abs(num) >= 1_000_000_000:
-            return f"{num / 1_000_000_000:.2f}B"
-        elif abs(num) >= 1_000_000:
-            return f"{num / 1_000_000:.2f}M"
-        elif abs(num) >= 1_000:
-            return f"{num / 1_000:.2f}K"
-        else:
-            return f"{num:.2f}"
+        abs_num = abs(num)
+        for threshold, divisor, suffix in _MAGNITUDES:
+            if abs_num >= threshold:
+                return f"{num / divisor:.2f}{suffix}"
+        return f"{num:.2f}"
     return num
 
 
+def _print_info(info):
+    """打印股票基本信息"""
+    for key, value in info.items():
+        if key == "市值" and isinstance(value, (int, float)):
+            print(f"   {key}: {format_number(value)}")
+        elif key == "股息率" and isinstance(value, (int, float)):
+            print(f"   {key}: {value * 100:.2f}%")
+        else:
+            print(f"   {key}: {value}")
+
+
+def _print_hist(hist, output=None):
+    """打印历史数据摘要，可选保存为 CSV"""
+    print(f"\n数据点数量: {len(hist)}")
+    print(f"日期范围: {hist.index[0]} 到 {hist.index[-1]}")
+
+    print("\n最近 10 条记录:")
+    print(hist.tail(10).to_string())
+
+    print("\n统计信息:")
+    print(hist.describe().to_string())
+
+    if output:
+        hist.to_csv(output)
+        print(f"\n✅ 数据已保存到: {output}")
+
+
 def main():
     parser = argparse.ArgumentParser(description="获取股票历史数据和基本信息")
     parser.add_argument(
-        "--ticker", required=True, help="股票代码（例如: AAPL, 0700.HK, 000001.SS）"
+        "--ticker",
+        required=True,
+        help="股票代码，可用逗号分隔多个（例如: AAPL 或 AAPL,0700.HK,000001.SS）",
     )
     parser.add_argument("--period", default="1mo", help="时间周期（默认: 1mo）")
     parser.add_argument("--interval", default="1d", help="数据间隔（默认: 1d）")
@@ -110,24 +259,77 @@ def main():
     parser.add_argument("--output", help="输出文件路径（CSV 格式）")
     parser.add_argument("--info-only", action="store_true", help="仅显示股票基本信息")
     parser.add_argument("--no-info", action="store_true", help="不显示股票基本信息")
+    parser.add_argument(
+        "--no-cache", action="store_true", help="跳过 HTTP 缓存，强制从网络获取"
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=int,
+        default=3600,
+        help="HTTP 缓存有效秒数（默认: 3600）",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="本地 Parquet 行情缓存目录（按 ticker/period/interval 建键，mtime 过期）",
+    )
 
     args = parser.parse_args()
 
+    session = yf_session.get_session(not args.no_cache, args.cache_ttl)
+
+    tickers = [t.strip() for t in args.ticker.split(",") if t.strip()]
+
+    # 多标的：一次 yf.download 并发抓取，info 走线程池（各端点相互独立）
+    if len(tickers) > 1:
+        infos = {}
+        if not args.no_info:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                futures = {
+                    tkr: executor.submit(get_stock_info, tkr, session)
+                    for tkr in tickers
+                }
+                infos = {tkr: future.result() for tkr, future in futures.items()}
+
+        hists = {}
+        if not args.info_only:
+            hists = get_many_stock_data(
+                tickers,
+                period=args.period,
+                interval=args.interval,
+                start=args.start,
+                end=args.end,
+                session=session,
+            )
+
+        for tkr in tickers:
+            print(f"\n📊 获取股票数据: {tkr}")
+            print("=" * 60)
+
+            if not args.no_info:
+                print("\n📋 股票基本信息:")
+                if infos.get(tkr):
+                    _print_info(infos[tkr])
+
+            if not args.info_only and tkr in hists:
+                print(f"\n📈 历史数据 (周期: {args.period}, 间隔: {args.interval}):")
+                output = None
+                if args.output:
+                    stem, dot, ext = args.output.rpartition(".")
+                    output = f"{stem}_{tkr}.{ext}" if dot else f"{args.output}_{tkr}"
+                _print_hist(hists[tkr], output)
+
+            print("\n" + "=" * 60)
+        return
+
     print(f"\n📊 获取股票数据: {args.ticker}")
     print("=" * 60)
 
     # 获取并显示股票基本信息
     if not args.no_info:
         print("\n📋 股票基本信息:")
-        info = get_stock_info(args.ticker)
+        info = get_stock_info(args.ticker, session=session)
         if info:
-            for key, value in info.items():
-                if key == "市值" and isinstance(value, (int, float)):
-                    print(f"   {key}: {format_number(value)}")
-                elif key == "股息率" and isinstance(value, (int, float)):
-                    print(f"   {key}: {value * 100:.2f}%")
-                else:
-                    print(f"   {key}: {value}")
+            _print_info(info)
 
     if args.info_only:
         return
@@ -140,25 +342,13 @@ def main():
         interval=args.interval,
         start=args.start,
         end=args.end,
+        session=session,
+        cache_dir=args.cache_dir,
+        cache_ttl=args.cache_ttl,
     )
 
     if hist is not None:
-        # 显示数据摘要
-        print(f"\n数据点数量: {len(hist)}")
-        print(f"日期范围: {hist.index[0]} 到 {hist.index[-1]}")
-
-        # 显示最近的数据
-        print("\n最近 10 条记录:")
-        print(hist.tail(10).to_string())
-
-        # 显示统计信息
-        print("\n统计信息:")
-        print(hist.describe().to_string())
-
-        # 保存到文件
-        if args.output:
-            hist.to_csv(args.output)
-            print(f"\n✅ 数据已保存到: {args.output}")
+        _print_hist(hist, args.output)
 
     print("\n" + "=" * 60)
 
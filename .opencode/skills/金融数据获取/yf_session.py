@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+yfinance 共享 HTTP 会话
+
+yfinance 支持传入自定义 session。优先使用 requests_cache 的 SQLite
+缓存会话：重复查询直接命中本地缓存（亚毫秒级），不再重新下载同样的
+CSV/JSON；未安装 requests_cache 时回退到带连接池的普通 Session。
+"""
+
+from functools import lru_cache
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+_CACHE_PATH = Path(__file__).parent / ".cache" / "yf_http_cache"
+
+
+def _mount(session):
+    """挂接共享连接池：复用 TLS 握手和 DNS 查询"""
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3),
+        ),
+    )
+    return session
+
+
+@lru_cache(maxsize=None)
+def get_session(use_cache=True, expire_after=3600):
+    """返回共享会话
+
+    Args:
+        use_cache: 是否启用磁盘 HTTP 缓存
+        expire_after: 缓存有效秒数
+
+    Returns:
+        Session: CachedSession（可用时）或普通 requests.Session
+    """
+    if use_cache:
+        try:
+            from requests_cache import CachedSession
+        except ImportError:
+            pass
+        else:
+            _CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            return _mount(
+                CachedSession(
+                    str(_CACHE_PATH), backend="sqlite", expire_after=expire_after
+                )
+            )
+
+    return _mount(requests.Session())
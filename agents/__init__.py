@@ -2,14 +2,24 @@
 金融分析 Agents 包
 """
 
-from agents.financial_analyst_team import create_financial_analyst_team
-from agents.technical_analysis_agent import create_technical_analysis_agent
-from agents.macro_analysis_agent import create_macro_analysis_agent
-from agents.fundamental_analysis_agent import create_fundamental_analysis_agent
-
-__all__ = [
-    "create_financial_analyst_team",
-    "create_technical_analysis_agent",
-    "create_macro_analysis_agent",
-    "create_fundamental_analysis_agent",
-]
+import importlib
+
+# 延迟导入（PEP 562）：包导入不再连带拉起全部 agent 模块
+# 及其工具依赖链（lxml、feedparser 等），按属性访问时才加载
+_EXPORTS = {
+    "TeamRunner": "agents.financial_analyst_team",
+    "arun_financial_analysis": "agents.financial_analyst_team",
+    "create_financial_analyst_team": "agents.financial_analyst_team",
+    "create_technical_analysis_agent": "agents.technical_analysis_agent",
+    "create_macro_analysis_agent": "agents.macro_analysis_agent",
+    "create_fundamental_analysis_agent": "agents.fundamental_analysis_agent",
+    "invalidate_members": "agents.financial_analyst_team",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
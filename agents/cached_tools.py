@@ -0,0 +1,117 @@
+"""
+带 TTL 缓存的网络工具
+
+热门标的在连续多轮对话里会反复命中同样的搜索词和文章 URL，
+每次都重新发起外部 HTTP 请求。这里给 DuckDuckGo / Newspaper4k
+包一层按查询建键的 TTL 缓存：搜索结果短缓存（时效性强），
+文章全文长缓存（发布后基本不变）。
+
+优先使用 cachetools.TTLCache（可选依赖），未安装时退回内置的
+简易 TTL 字典实现。
+"""
+
+import functools
+import time
+
+# 搜索结果 15 分钟、文章全文 6 小时
+_SEARCH_TTL = 15 * 60
+_ARTICLE_TTL = 6 * 60 * 60
+_MAXSIZE = 1024
+
+try:
+    from cachetools import TTLCache
+except ImportError:
+    TTLCache = None
+
+
+class _SimpleTTLCache:
+    """cachetools 缺席时的最小 TTL 缓存（非线程安全，与 TTLCache 同接口子集）"""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = {}
+
+    def __getitem__(self, key):
+        expires_at, value = self._data[key]
+        if time.monotonic() >= expires_at:
+            del self._data[key]
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if len(self._data) >= self.maxsize:
+            # 简单淘汰最早写入的条目
+            self._data.pop(next(iter(self._data)))
+        self._data[key] = (time.monotonic() + self.ttl, value)
+
+
+def _make_cache(ttl):
+    if TTLCache is not None:
+        return TTLCache(maxsize=_MAXSIZE, ttl=ttl)
+    return _SimpleTTLCache(maxsize=_MAXSIZE, ttl=ttl)
+
+
+_SEARCH_CACHE = _make_cache(_SEARCH_TTL)
+_ARTICLE_CACHE = _make_cache(_ARTICLE_TTL)
+
+
+def _ttl_cached(cache, method, name):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        key = (name, args, tuple(sorted(kwargs.items())))
+        try:
+            return cache[key]
+        except (KeyError, TypeError):
+            pass
+        result = method(*args, **kwargs)
+        try:
+            cache[key] = result
+        except TypeError:
+            pass
+        return result
+
+    return wrapper
+
+
+def _wrap_methods(tool, names, cache):
+    """把工具实例上存在的方法换成带缓存的版本
+
+    agno 工具把入口函数注册在 self.functions 里，重绑定方法后
+    同步替换注册的 entrypoint，确保 agent 调用也走缓存。
+    """
+    for name in names:
+        method = getattr(tool, name, None)
+        if not callable(method):
+            continue
+        cached = _ttl_cached(cache, method, name)
+        setattr(tool, name, cached)
+        registered = getattr(tool, "functions", {}).get(name)
+        if registered is not None and hasattr(registered, "entrypoint"):
+            registered.entrypoint = cached
+
+
+def cached_duckduckgo_tools(**params):
+    """构建带搜索缓存的 DuckDuckGoTools"""
+    from agno.tools.duckduckgo import DuckDuckGoTools
+
+    tool = DuckDuckGoTools(**params)
+    _wrap_methods(
+        tool,
+        ("duckduckgo_search", "duckduckgo_news", "search", "news"),
+        _SEARCH_CACHE,
+    )
+    return tool
+
+
+def cached_newspaper4k_tools(**params):
+    """构建带文章全文缓存的 Newspaper4kTools"""
+    from agno.tools.newspaper4k import Newspaper4kTools
+
+    tool = Newspaper4kTools(**params)
+    _wrap_methods(
+        tool,
+        ("read_article", "get_article_text", "get_article_data"),
+        _ARTICLE_CACHE,
+    )
+    return tool
@@ -3,15 +3,42 @@
 协调分析金融问题，整合基本面分析、技术分析和宏观经济分析
 """
 
+import asyncio
+import importlib
+
 from agno.team import Team
-from agno.tools.duckduckgo import DuckDuckGoTools
-from agno.tools.newspaper4k import Newspaper4kTools
-from agno.tools.tavily import TavilyTools
 
-from agents.technical_analysis_agent import create_technical_analysis_agent
-from agents.macro_analysis_agent import create_macro_analysis_agent
-from agents.fundamental_analysis_agent import create_fundamental_analysis_agent
 from config_loader import get_agent_config, get_model_config, config, get_tool_config
+from utils import llm_cache
+
+# 工具类和子 agent 工厂都在用到时才导入：Newspaper4k/DuckDuckGo 会
+# 传递拉起 lxml、feedparser 等重依赖，宏观问题未必需要全部成员
+
+# 成员名 -> 模块路径，模块在首次创建该成员时才导入
+_AGENT_MODULES = {
+    "fundamental_analysis": "agents.fundamental_analysis_agent",
+    "technical_analysis": "agents.technical_analysis_agent",
+    "macro_analysis": "agents.macro_analysis_agent",
+}
+
+# 进程内已构建的成员实例：重复构建团队时复用，
+# 免去模型客户端和工具的重复实例化
+_MEMBER_CACHE: dict = {}
+
+
+def _create_member(member_name: str):
+    """导入成员模块并构建 agent（低温度成员的 run/arun 带响应缓存）"""
+    module = importlib.import_module(_AGENT_MODULES[member_name])
+    creator = getattr(module, f"create_{member_name}_agent")
+    return llm_cache.wrap_agent(creator(), get_model_config(member_name))
+
+
+def invalidate_members():
+    """清空成员实例缓存
+
+    配置 reload 后模型参数可能已变化，需要在下次构建团队前调用。
+    """
+    _MEMBER_CACHE.clear()
 
 
 def create_financial_analyst_team() -> Team:
@@ -234,18 +261,15 @@ def create_financial_analyst_team() -> Team:
         ["fundamental_analysis", "technical_analysis", "macro_analysis"],
     )
 
-    # 创建 agent 映射
-    agent_creators = {
-        "fundamental_analysis": create_fundamental_analysis_agent,
-        "technical_analysis": create_technical_analysis_agent,
-        "macro_analysis": create_macro_analysis_agent,
-    }
-
-    # 按配置顺序创建成员
+    # 按配置顺序创建成员；实例按名字缓存在进程内，
+    # 成员模块按需导入，未列入配置的成员不付导入开销
     members = []
     for member_name in member_order:
-        if member_name in agent_creators:
-            members.append(agent_creators[member_name]())
+        if member_name not in _AGENT_MODULES:
+            continue
+        if member_name not in _MEMBER_CACHE:
+            _MEMBER_CACHE[member_name] = _create_member(member_name)
+        members.append(_MEMBER_CACHE[member_name])
 
     # 使用配置创建模型实例（自动支持不同的 provider）
     model = model_config.get_model_instance()
@@ -256,6 +280,8 @@ def create_financial_analyst_team() -> Team:
     # Tavily 搜索工具（AI 优化的搜索引擎）
     tavily_config = get_tool_config("team", "tavily")
     if tavily_config.get("enabled", False):
+        from agno.tools.tavily import TavilyTools
+
         tavily_params = {}
         if "search_depth" in tavily_config:
             tavily_params["search_depth"] = tavily_config["search_depth"]
@@ -266,6 +292,8 @@ def create_financial_analyst_team() -> Team:
     # DuckDuckGo 搜索工具（备用）
     ddg_config = get_tool_config("team", "duckduckgo")
     if ddg_config.get("enabled", False):
+        from agents.cached_tools import cached_duckduckgo_tools
+
         ddg_params = {}
         if "search" in ddg_config:
             ddg_params["enable_search"] = ddg_config["search"]
@@ -273,12 +301,14 @@ def create_financial_analyst_team() -> Team:
             ddg_params["enable_news"] = ddg_config["news"]
         if "fixed_max_results" in ddg_config:
             ddg_params["fixed_max_results"] = ddg_config["fixed_max_results"]
-        team_tools.append(DuckDuckGoTools(**ddg_params))
+        team_tools.append(cached_duckduckgo_tools(**ddg_params))
 
     # Newspaper4k 工具
     np4k_config = get_tool_config("team", "newspaper4k")
     if np4k_config.get("enabled", False):
-        team_tools.append(Newspaper4kTools())
+        from agents.cached_tools import cached_newspaper4k_tools
+
+        team_tools.append(cached_newspaper4k_tools())
 
     # 准备团队参数
     team_params = {
@@ -306,3 +336,138 @@ def create_financial_analyst_team() -> Team:
     team = Team(**team_params)
 
     return team
+
+
+async def arun_members_parallel(team: Team, prompt: str, max_concurrency: int = 3):
+    """并行调度全部团队成员分析同一问题
+
+    子 agent 的调用是 I/O 密集的 LLM 请求，串行委派时总耗时
+    约等于各成员耗时之和；用 asyncio.gather 扇出后接近单个成员的耗时。
+    Semaphore 限制并发数，避免触发 provider 的速率限制。
+
+    Returns:
+        list: 与 team.members 顺序对应的结果列表（异常原样保留，不中断其他成员）
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_one(member):
+        async with semaphore:
+            return await member.arun(prompt)
+
+    tasks = [asyncio.create_task(run_one(member)) for member in team.members]
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# 早停判定：短于该长度的成员结果视为信息不足，不触发早停
+_EARLY_STOP_MIN_CHARS = 200
+
+
+def _is_sufficient(result) -> bool:
+    """粗判单个成员的结果是否完整到足以直接交给 Leader 整合"""
+    content = getattr(result, "content", None)
+    if not isinstance(content, str) or len(content) < _EARLY_STOP_MIN_CHARS:
+        return False
+    # agent 约定用〔数据待补充〕标注缺口，出现即认为不完整
+    return "数据待补充" not in content
+
+
+async def arun_members_early_stop(team: Team, prompt: str, max_concurrency: int = 3):
+    """并发调度成员，首个足够完整的结果出现时取消其余任务
+
+    单一维度的问题（如纯宏观）往往第一个返回的成员就能回答，
+    等满全员只是拖长尾延迟、多花 token；早停把耗时压到最快成员，
+    并通过取消省掉未完成调用的费用。
+
+    Returns:
+        list: (member, 结果或异常) 二元组，按完成顺序排列
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_one(member):
+        async with semaphore:
+            return await member.arun(prompt)
+
+    tasks = {asyncio.create_task(run_one(member)): member for member in team.members}
+    pending = set(tasks)
+    finished = []
+    while pending:
+        done, pending = await asyncio.wait(
+            pending, return_when=asyncio.FIRST_COMPLETED
+        )
+        for task in done:
+            exc = task.exception()
+            result = exc if exc is not None else task.result()
+            finished.append((tasks[task], result))
+            if exc is None and _is_sufficient(result) and pending:
+                for outstanding in pending:
+                    outstanding.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                return finished
+    return finished
+
+
+async def arun_financial_analysis(team: Team, prompt: str, session_id=None):
+    """异步运行一次综合分析
+
+    当配置 agents.team.parallel_dispatch 开启时，先并行收集所有成员的
+    分析结果，再把结果一次性交给 Team Leader 整合，省去逐个委派的等待；
+    叠加 agents.team.early_stop 后，首个完整结果即提前返回。
+    两者都关闭时退回 Team 自身的调度逻辑。
+    """
+    if not config.get("agents.team.parallel_dispatch", False):
+        return await team.arun(prompt, session_id=session_id)
+
+    max_concurrency = config.get("agents.team.max_concurrency", 3)
+    if config.get("agents.team.early_stop", False):
+        pairs = await arun_members_early_stop(team, prompt, max_concurrency)
+    else:
+        results = await arun_members_parallel(team, prompt, max_concurrency)
+        pairs = list(zip(team.members, results))
+
+    sections = []
+    for member, result in pairs:
+        if isinstance(result, Exception):
+            sections.append(f"### {member.name}\n（分析失败: {result}）")
+        else:
+            content = getattr(result, "content", None)
+            sections.append(f"### {member.name}\n{content if content else result}")
+
+    synthesis_prompt = (
+        f"用户问题：\n{prompt}\n\n"
+        "以下是各团队成员已完成的分析结果，请按照你的整合输出规范，"
+        "直接基于这些结果提炼洞察并输出综合分析报告（不需要再次调用成员）：\n\n"
+        + "\n\n".join(sections)
+    )
+    return await team.arun(synthesis_prompt, session_id=session_id)
+
+
+class TeamRunner:
+    """团队的批量运行包装
+
+    多个相互独立的分析请求（如对比多只标的时的逐个分析）串行执行时
+    总耗时随请求数线性增长；这里用 asyncio.gather 并发执行，
+    HTTP 往返和排队等待在请求间摊薄。
+    """
+
+    def __init__(self, team: Team, max_concurrency: int = None):
+        self.team = team
+        if max_concurrency is None:
+            max_concurrency = config.get("agents.team.max_concurrency", 3)
+        self.max_concurrency = max_concurrency
+
+    async def _run_one(self, prompt: str, semaphore: asyncio.Semaphore):
+        async with semaphore:
+            return await arun_financial_analysis(self.team, prompt)
+
+    async def run_batch_async(self, prompts):
+        """并发运行一组独立的分析请求
+
+        Returns:
+            list: 与 prompts 顺序对应的结果列表（异常原样保留，不中断其他请求）
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = [
+            asyncio.create_task(self._run_one(prompt, semaphore))
+            for prompt in prompts
+        ]
+        return await asyncio.gather(*tasks, return_exceptions=True)
@@ -4,11 +4,136 @@
 """
 
 import os
+import pickle
 import yaml
+from functools import lru_cache
+
 from pathlib import Path
 from typing import Any, Dict, Optional
 from dataclasses import dataclass
 
+# libyaml 的 C 解析器比纯 Python 实现快 5-10 倍，未编译时退回 SafeLoader
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# 按路径缓存解析结果：{path: (st_mtime_ns, st_size, 解析后的 dict)}
+# 文件未变时 reload() 只需一次 stat，不再重新解析
+_PARSE_CACHE: Dict[str, tuple] = {}
+
+# 各 provider 对应的 API Key 环境变量（环境变量优先于配置文件）
+_ENV_VAR_MAP = {
+    "openai": "OPENAI_API_KEY",
+    "openai-compatible": "OPENAI_API_KEY",
+    "anthropic": "ANTHROPIC_API_KEY",
+    "anthropic-compatible": "ANTHROPIC_API_KEY",
+}
+
+
+@lru_cache(maxsize=1)
+def _shared_http_client():
+    """共享的 httpx.AsyncClient
+
+    每个模型实例默认各自建客户端，三个子 agent 并发打同一端点时
+    TLS 握手（约 50-150ms）一次都省不掉；共享连接池后握手只付一次。
+    进程退出时通过 atexit 关闭。
+    """
+    import asyncio
+    import atexit
+
+    import httpx
+
+    client = httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        timeout=60,
+    )
+
+    def _close():
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            try:
+                asyncio.run(client.aclose())
+            except Exception:
+                pass
+
+    atexit.register(_close)
+    return client
+
+
+def _use_shared_pool() -> bool:
+    return config.get_system_config("performance.shared_http_pool", False)
+
+
+@lru_cache(maxsize=32)
+def _build_model(
+    provider: str,
+    id: str,
+    temperature: float,
+    max_tokens: Optional[int],
+    api_key: Optional[str],
+    base_url: Optional[str],
+    cache_system_prompt: bool,
+    cache_response: bool,
+    cache_ttl: Optional[int],
+    shared_pool: bool = False,
+):
+    """按配置参数构建模型实例（同参数复用同一实例）
+
+    每个子 agent 和 Team Leader 都会请求模型实例，相同配置下
+    没必要重复付出 provider 导入、客户端构造和 HTTP 会话初始化的开销。
+    provider 的导入放在函数内，首次调用前仍然是延迟的。
+    """
+    if provider == "openai" or provider == "openai-compatible":
+        from agno.models.openai import OpenAIChat
+
+        params = {
+            "id": id,
+            "temperature": temperature,
+        }
+        if max_tokens:
+            params["max_tokens"] = max_tokens
+        if api_key:
+            params["api_key"] = api_key
+        if base_url:
+            params["base_url"] = base_url
+        # 异步调用路径共享连接池（见 _shared_http_client）
+        if shared_pool:
+            params["http_client"] = _shared_http_client()
+        return OpenAIChat(**params)
+
+    elif provider == "anthropic" or provider == "anthropic-compatible":
+        from agno.models.anthropic import Claude
+
+        params = {
+            "id": id,
+            "temperature": temperature,
+        }
+        if max_tokens:
+            params["max_tokens"] = max_tokens
+        if api_key:
+            params["api_key"] = api_key
+        # 第三方 Anthropic API 的 base_url 需要通过 client_params 传递
+        if provider == "anthropic-compatible" and base_url:
+            params["client_params"] = {"base_url": base_url}
+        # Caching 参数
+        if cache_system_prompt:
+            params["cache_system_prompt"] = True
+        if cache_response:
+            params["cache_response"] = True
+        if cache_ttl:
+            params["cache_ttl"] = cache_ttl
+        # 异步调用路径共享连接池（见 _shared_http_client）；
+        # Claude 构建客户端时会用自身的 http_client 字段覆盖
+        # client_params["http_client"]，所以必须走 http_client 参数
+        if shared_pool:
+            params["http_client"] = _shared_http_client()
+        return Claude(**params)
+
+    else:
+        raise ValueError(f"不支持的模型提供商: {provider}")
+
 
 @dataclass
 class ModelConfig:
@@ -25,84 +150,19 @@ class ModelConfig:
     cache_ttl: Optional[int] = None  # Response cache TTL（秒）
 
     def get_model_instance(self):
-        """根据配置创建模型实例"""
-        if self.provider == "openai":
-            from agno.models.openai import OpenAIChat
-
-            params = {
-                "id": self.id,
-                "temperature": self.temperature,
-            }
-            if self.max_tokens:
-                params["max_tokens"] = self.max_tokens
-            if self.api_key:
-                params["api_key"] = self.api_key
-            if self.base_url:
-                params["base_url"] = self.base_url
-            return OpenAIChat(**params)
-
-        elif self.provider == "anthropic":
-            from agno.models.anthropic import Claude
-
-            params = {
-                "id": self.id,
-                "temperature": self.temperature,
-            }
-            if self.max_tokens:
-                params["max_tokens"] = self.max_tokens
-            if self.api_key:
-                params["api_key"] = self.api_key
-            # Caching 参数
-            if self.cache_system_prompt:
-                params["cache_system_prompt"] = True
-            if self.cache_response:
-                params["cache_response"] = True
-            if self.cache_ttl:
-                params["cache_ttl"] = self.cache_ttl
-            return Claude(**params)
-
-        elif self.provider == "openai-compatible":
-            # 兼容 OpenAI API 的其他提供商
-            from agno.models.openai import OpenAIChat
-
-            params = {
-                "id": self.id,
-                "temperature": self.temperature,
-            }
-            if self.max_tokens:
-                params["max_tokens"] = self.max_tokens
-            if self.api_key:
-                params["api_key"] = self.api_key
-            if self.base_url:
-                params["base_url"] = self.base_url
-            return OpenAIChat(**params)
-
-        elif self.provider == "anthropic-compatible":
-            # 兼容 Anthropic API 的其他提供商（第三方 Anthropic API）
-            from agno.models.anthropic import Claude
-
-            params = {
-                "id": self.id,
-                "temperature": self.temperature,
-            }
-            if self.max_tokens:
-                params["max_tokens"] = self.max_tokens
-            if self.api_key:
-                params["api_key"] = self.api_key
-            # base_url 需要通过 client_params 传递
-            if self.base_url:
-                params["client_params"] = {"base_url": self.base_url}
-            # Caching 参数
-            if self.cache_system_prompt:
-                params["cache_system_prompt"] = True
-            if self.cache_response:
-                params["cache_response"] = True
-            if self.cache_ttl:
-                params["cache_ttl"] = self.cache_ttl
-            return Claude(**params)
-
-        else:
-            raise ValueError(f"不支持的模型提供商: {self.provider}")
+        """根据配置创建模型实例（同参数复用缓存实例）"""
+        return _build_model(
+            self.provider,
+            self.id,
+            self.temperature,
+            self.max_tokens,
+            self.api_key,
+            self.base_url,
+            self.cache_system_prompt,
+            self.cache_response,
+            self.cache_ttl,
+            _use_shared_pool(),
+        )
 
 
 @dataclass
@@ -147,6 +207,7 @@ class Config:
 
     _instance = None
     _config: Dict[str, Any] = None
+    _flat: Dict[str, Any] = None
 
     def __new__(cls):
         if cls._instance is None:
@@ -154,6 +215,11 @@ class Config:
         return cls._instance
 
     def __init__(self):
+        if not hasattr(self, "_api_key_cache"):
+            self._api_key_cache: Dict[str, Optional[str]] = {}
+            # 配置不变时 ModelConfig/AgentConfig 也不变，按 agent_type 复用实例
+            self._model_config_cache: Dict[str, ModelConfig] = {}
+            self._agent_config_cache: Dict[str, AgentConfig] = {}
         if self._config is None:
             self.load()
 
@@ -166,8 +232,52 @@ class Config:
         if not os.path.exists(config_path):
             raise FileNotFoundError(f"配置文件不存在: {config_path}")
 
+        st = os.stat(config_path)
+        cached = _PARSE_CACHE.get(str(config_path))
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            self._config = cached[2]
+        else:
+            self._config = self._parse_config_file(config_path, st)
+            _PARSE_CACHE[str(config_path)] = (st.st_mtime_ns, st.st_size, self._config)
+
+        # 预展平成 "a.b.c" -> 值 的映射（中间层的 dict 也保留），
+        # get() 就从逐层 split + 遍历变成一次哈希查找
+        flat: Dict[str, Any] = {}
+        if isinstance(self._config, dict):
+            self._flatten(self._config, "", flat)
+        type(self)._flat = flat
+
+    @staticmethod
+    def _parse_config_file(config_path, st) -> Dict[str, Any]:
+        """解析配置文件，带 pickle 快路径
+
+        冷启动时反序列化 config.yaml.cache（pickle）比解析 YAML
+        快一个数量级以上；缓存 mtime 落后于源文件时重新解析并刷新。
+        缓存文件只被本项目自己读写，与 config.yaml 同目录。
+        """
+        cache_path = Path(f"{config_path}.cache")
+        try:
+            if cache_path.stat().st_mtime_ns >= st.st_mtime_ns:
+                return pickle.loads(cache_path.read_bytes())
+        except (OSError, pickle.PickleError, EOFError):
+            pass
+
         with open(config_path, "r", encoding="utf-8") as f:
-            self._config = yaml.safe_load(f)
+            parsed = yaml.load(f, Loader=_YamlLoader)
+        try:
+            cache_path.write_bytes(pickle.dumps(parsed, protocol=5))
+        except OSError:
+            pass
+        return parsed
+
+    @staticmethod
+    def _flatten(node: Dict[str, Any], prefix: str, out: Dict[str, Any]):
+        """递归展平嵌套配置，每个前缀路径都作为键存入 out"""
+        for key, value in node.items():
+            path = f"{prefix}{key}"
+            out[path] = value
+            if isinstance(value, dict):
+                Config._flatten(value, path + ".", out)
 
     def get(self, key: str, default: Any = None) -> Any:
         """获取配置项
@@ -179,16 +289,7 @@ class Config:
         Returns:
             配置值
         """
-        keys = key.split(".")
-        value = self._config
-
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
-
-        return value
+        return self._flat.get(key, default)
 
     def get_model_config(self, agent_type: str = "default") -> ModelConfig:
         """获取模型配置
@@ -199,21 +300,53 @@ class Config:
         Returns:
             ModelConfig 对象
         """
+        cached = self._model_config_cache.get(agent_type)
+        if cached is not None:
+            return cached
+
         model_config = self.get(f"models.{agent_type}")
         if model_config is None:
             model_config = self.get("models.default")
 
-        return ModelConfig(
-            provider=model_config.get("provider", "openai"),
+        provider = model_config.get("provider", "openai")
+        result = ModelConfig(
+            provider=provider,
             id=model_config.get("id", "gpt-4o"),
             temperature=model_config.get("temperature", 0.7),
             max_tokens=model_config.get("max_tokens"),
-            api_key=model_config.get("api_key"),
+            api_key=model_config.get("api_key") or self.get_api_key(provider),
             base_url=model_config.get("base_url"),
             cache_system_prompt=model_config.get("cache_system_prompt", False),
             cache_response=model_config.get("cache_response", False),
             cache_ttl=model_config.get("cache_ttl"),
         )
+        self._model_config_cache[agent_type] = result
+        return result
+
+    def get_api_key(self, provider: str) -> Optional[str]:
+        """获取 provider 的 API Key
+
+        优先读环境变量（如 OPENAI_API_KEY），其次读配置文件的
+        system.*_api_key 备用项；解析结果按 provider 缓存在实例上，
+        后续同一 provider 的查询不再走 os.getenv。
+
+        Args:
+            provider: 模型提供商，如 "openai", "anthropic-compatible"
+
+        Returns:
+            API Key，未配置时为 None
+        """
+        if provider in self._api_key_cache:
+            return self._api_key_cache[provider]
+
+        env_var = _ENV_VAR_MAP.get(provider)
+        api_key = os.getenv(env_var) if env_var else None
+        if not api_key:
+            # "anthropic-compatible" 复用 "anthropic_api_key" 配置项
+            api_key = self.get_system_config(f"{provider.split('-')[0]}_api_key")
+
+        self._api_key_cache[provider] = api_key
+        return api_key
 
     def get_agent_config(self, agent_type: str) -> AgentConfig:
         """获取 Agent 配置
@@ -224,6 +357,10 @@ class Config:
         Returns:
             AgentConfig 对象
         """
+        cached = self._agent_config_cache.get(agent_type)
+        if cached is not None:
+            return cached
+
         agent_config = self.get(f"agents.{agent_type}", {})
 
         # 解析历史配置
@@ -236,7 +373,7 @@ class Config:
                 num_messages=history_data.get("num_messages"),
             )
 
-        return AgentConfig(
+        result = AgentConfig(
             name=agent_config.get("name", "Agent"),
             role=agent_config.get("role", "AI Assistant"),
             markdown=agent_config.get("markdown", True),
@@ -244,6 +381,8 @@ class Config:
             tools=agent_config.get("tools", {}),
             history=history_config,
         )
+        self._agent_config_cache[agent_type] = result
+        return result
 
     def get_tool_config(self, agent_type: str, tool_name: str) -> Dict[str, Any]:
         """获取工具配置
@@ -297,6 +436,10 @@ class Config:
     def reload(self):
         """重新加载配置文件"""
         self._config = None
+        self._api_key_cache.clear()
+        self._model_config_cache.clear()
+        self._agent_config_cache.clear()
+        _build_model.cache_clear()
         self.load()
 
     def __repr__(self) -> str:
@@ -3,12 +3,14 @@
 使用 Agno 框架构建的综合金融分析系统
 """
 
+import asyncio
+import signal
 from pathlib import Path
 
 from agents.financial_analyst_team import create_financial_analyst_team
 from config_loader import config
 from dotenv import load_dotenv
-from utils.reporting import append_report_from_last_run, setup_reporting
+from utils.reporting import setup_reporting, stream_response_to_report
 
 load_dotenv()
 
@@ -46,6 +48,70 @@ def interactive_mode():
     print("  - 输入 'help' 查看更多帮助")
     print()
 
+    # prompt_toolkit 可用时走异步循环（行编辑 + 跨会话历史 +
+    # Ctrl+C 只中断当前一轮），未安装则退回阻塞式 input() 循环
+    try:
+        from prompt_toolkit import PromptSession  # noqa: F401
+
+        loop_runner = lambda: asyncio.run(  # noqa: E731
+            _async_interactive_loop(team, session_id, save_reports, report_context)
+        )
+    except ImportError:
+        loop_runner = lambda: _interactive_loop(  # noqa: E731
+            team, session_id, save_reports, report_context
+        )
+
+    try:
+        loop_runner()
+    except KeyboardInterrupt:
+        # 信号处理器未接管时（如非主线程）的兜底，保持基线的优雅退出
+        print("\n👋 再见！")
+    finally:
+        # 退出（含 Ctrl+C）时关闭报告文件句柄
+        if report_context is not None:
+            report_context.close()
+
+
+def _print_help():
+    print("\n📖 帮助信息：")
+    print("  支持的分析类型：")
+    print("    - 个股综合分析：例如 '分析苹果公司(AAPL)的投资价值'")
+    print("    - 基本面分析：例如 '特斯拉的财务状况如何？'")
+    print("    - 技术分析：例如 'NVDA的技术面现在怎么样？'")
+    print("    - 宏观分析：例如 '当前美国经济形势如何？'")
+    print("    - 行业分析：例如 '电动车行业的前景如何？'")
+    print("  多轮对话示例：")
+    print("    第1轮: '分析苹果公司'")
+    print("    第2轮: '它的财务状况如何？' (会记住之前说的是苹果)")
+    print("    第3轮: '和微软比呢？' (会结合之前的上下文)")
+    print()
+
+
+def _run_turn(team, session_id, save_reports, report_context, user_input):
+    """运行一轮分析（流式输出），使用固定的 session_id 实现多轮对话
+
+    保存报告时边流式输出边把增量写入报告文件。
+    """
+    print("\n🤔 正在分析，请稍候...")
+    print("-" * 60)
+
+    if save_reports:
+        stream_response_to_report(
+            team=team,
+            session_id=session_id,
+            user_input=user_input,
+            report_context=report_context,
+        )
+    else:
+        team.print_response(user_input, stream=True, session_id=session_id)
+
+    print()
+    print("-" * 60)
+    print()
+
+
+def _interactive_loop(team, session_id, save_reports, report_context):
+    """交互主循环（阻塞式 input，prompt_toolkit 不可用时的退路）"""
     while True:
         try:
             user_input = input("👤 你的问题: ").strip()
@@ -58,46 +124,94 @@ def interactive_mode():
                 break
 
             if user_input.lower() == "help":
-                print("\n📖 帮助信息：")
-                print("  支持的分析类型：")
-                print("    - 个股综合分析：例如 '分析苹果公司(AAPL)的投资价值'")
-                print("    - 基本面分析：例如 '特斯拉的财务状况如何？'")
-                print("    - 技术分析：例如 'NVDA的技术面现在怎么样？'")
-                print("    - 宏观分析：例如 '当前美国经济形势如何？'")
-                print("    - 行业分析：例如 '电动车行业的前景如何？'")
-                print("  多轮对话示例：")
-                print("    第1轮: '分析苹果公司'")
-                print("    第2轮: '它的财务状况如何？' (会记住之前说的是苹果)")
-                print("    第3轮: '和微软比呢？' (会结合之前的上下文)")
-                print()
+                _print_help()
                 continue
 
-            print("\n🤔 正在分析，请稍候...")
-            print("-" * 60)
-
-            # 运行分析（流式输出），使用固定的 session_id 实现多轮对话
-            team.print_response(user_input, stream=True, session_id=session_id)
+            _run_turn(team, session_id, save_reports, report_context, user_input)
 
-            print()
-            print("-" * 60)
+        except KeyboardInterrupt:
+            print("\n\n👋 再见！")
+            break
+        except Exception as e:
+            print(f"\n❌ 发生错误: {str(e)}")
+            print("请重试或输入 'quit' 退出")
             print()
 
-            # 将本轮对话写入报告
-            if save_reports:
-                append_report_from_last_run(
-                    report_context=report_context,
-                    team=team,
-                    session_id=session_id,
-                    user_input=user_input,
-                )
 
-        except KeyboardInterrupt:
-            print("\n\n👋 再见！")
+async def _async_interactive_loop(team, session_id, save_reports, report_context):
+    """交互主循环（prompt_toolkit 版）
+
+    prompt_async 提供行编辑和保存在 .fin_history 的跨会话输入历史；
+    团队运行放在后台线程任务里，输入提示处 Ctrl+C 才退出程序，
+    分析进行中的 Ctrl+C 只放弃当前一轮。
+    """
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.history import FileHistory
+
+    prompt_session = PromptSession(
+        history=FileHistory(str(Path(__file__).parent / ".fin_history"))
+    )
+
+    while True:
+        try:
+            user_input = (await prompt_session.prompt_async("👤 你的问题: ")).strip()
+        except (KeyboardInterrupt, EOFError):
+            print("\n👋 再见！")
+            break
+
+        if not user_input:
+            continue
+
+        if user_input.lower() in ["quit", "exit", "q"]:
+            print("\n👋 再见！")
             break
+
+        if user_input.lower() == "help":
+            _print_help()
+            continue
+
+        loop = asyncio.get_running_loop()
+        task = asyncio.create_task(
+            asyncio.to_thread(
+                _run_turn, team, session_id, save_reports, report_context, user_input
+            )
+        )
+        interrupted = False
+
+        def _abandon_turn():
+            nonlocal interrupted
+            interrupted = True
+            task.cancel()
+
+        # asyncio.Runner 默认把 SIGINT 变成取消整个主任务（表现为
+        # CancelledError 一路抛出、程序整个退出）；分析期间临时接管
+        # 信号，让 Ctrl+C 只取消对当前一轮的等待
+        try:
+            loop.add_signal_handler(signal.SIGINT, _abandon_turn)
+            handler_installed = True
+        except (NotImplementedError, ValueError):
+            handler_installed = False
+
+        try:
+            await task
+        except asyncio.CancelledError:
+            if not interrupted:
+                raise
+            # to_thread 的工作线程无法强停，只是不再等待它；
+            # 流式输出可能还会持续片刻
+            print("\n⏹️  已放弃当前一轮分析（后台输出可能还会持续片刻）")
+            print()
+        except KeyboardInterrupt:
+            # 信号处理器装不上时的退路：放弃本轮但不退出程序
+            print("\n⏹️  已放弃当前一轮分析")
+            print()
         except Exception as e:
             print(f"\n❌ 发生错误: {str(e)}")
             print("请重试或输入 'quit' 退出")
             print()
+        finally:
+            if handler_installed:
+                loop.remove_signal_handler(signal.SIGINT)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,144 @@
+"""
+LLM 响应缓存
+
+相同的子提示词（如"分析 AAPL 基本面"）在演示、评测和热门标的场景下
+会被反复发给同一个模型，每次都是一轮完整的 LLM 请求和 token 开销。
+这里按 (model_id, temperature, prompt, tools) 的 sha256 建键缓存响应文本，
+命中时直接返回本地结果。
+
+后端优先使用 diskcache（可选依赖，自带过期管理），未安装时退回
+目录下按 key 存 JSON 文件、mtime 过期的实现。只对低温度
+（temperature <= 0.3）的确定性输出启用，高温度采样缓存会固化单次结果。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from functools import lru_cache
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Optional
+
+from config_loader import config
+
+# 高于该温度的模型输出视为非确定性，不做缓存
+_MAX_CACHEABLE_TEMPERATURE = 0.3
+
+_DEFAULT_TTL = 3600
+
+
+def _cache_dir() -> Path:
+    path = Path(config.get_system_config("cache.dir", ".llm_cache"))
+    if not path.is_absolute():
+        path = Path(__file__).parent.parent / path
+    return path
+
+
+@lru_cache(maxsize=1)
+def _diskcache():
+    """diskcache 可选依赖；未安装时返回 None，走文件后端"""
+    try:
+        import diskcache
+
+        return diskcache.Cache(str(_cache_dir() / "diskcache"))
+    except ImportError:
+        return None
+
+
+def make_key(model_id, temperature, prompt, tool_names) -> str:
+    payload = json.dumps(
+        {
+            "model": model_id,
+            "temp": temperature,
+            "prompt": prompt,
+            "tools": sorted(tool_names),
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get(key: str) -> Optional[Any]:
+    """读取缓存值，未命中或已过期返回 None"""
+    backend = _diskcache()
+    if backend is not None:
+        return backend.get(key)
+
+    path = _cache_dir() / f"{key}.json"
+    try:
+        with open(path, encoding="utf-8") as f:
+            entry = json.load(f)
+        if time.time() - path.stat().st_mtime >= entry.get("ttl", _DEFAULT_TTL):
+            return None
+        return entry["value"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def set(key: str, value: Any, ttl: Optional[int] = None) -> None:
+    """写入缓存（缓存失败不影响主流程）"""
+    if ttl is None:
+        ttl = config.get_system_config("cache.ttl_seconds", _DEFAULT_TTL)
+
+    backend = _diskcache()
+    if backend is not None:
+        backend.set(key, value, expire=ttl)
+        return
+
+    try:
+        cache_dir = _cache_dir()
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(cache_dir / f"{key}.json", "w", encoding="utf-8") as f:
+            json.dump({"ttl": ttl, "value": value}, f, ensure_ascii=False)
+    except (OSError, TypeError):
+        pass
+
+
+def wrap_agent(agent, model_config):
+    """给 agent 的 run/arun 包一层响应缓存
+
+    只缓存响应的文本内容，命中时返回带 content 属性的轻量对象；
+    temperature > 0.3 或缓存未启用时原样返回 agent。
+    """
+    if not config.get_system_config("cache.enabled", False):
+        return agent
+    temperature = model_config.temperature
+    if temperature is not None and temperature > _MAX_CACHEABLE_TEMPERATURE:
+        return agent
+
+    ttl = config.get_system_config("cache.ttl_seconds", _DEFAULT_TTL)
+    tool_names = [type(tool).__name__ for tool in (agent.tools or [])]
+    original_run = agent.run
+    original_arun = agent.arun
+
+    def _key(prompt):
+        return make_key(model_config.id, temperature, str(prompt), tool_names)
+
+    def cached_run(prompt, *args, **kwargs):
+        key = _key(prompt)
+        hit = get(key)
+        if hit is not None:
+            return SimpleNamespace(content=hit, cached=True)
+        result = original_run(prompt, *args, **kwargs)
+        content = getattr(result, "content", None)
+        if isinstance(content, str) and content:
+            set(key, content, ttl)
+        return result
+
+    async def cached_arun(prompt, *args, **kwargs):
+        key = _key(prompt)
+        hit = get(key)
+        if hit is not None:
+            return SimpleNamespace(content=hit, cached=True)
+        result = await original_arun(prompt, *args, **kwargs)
+        content = getattr(result, "content", None)
+        if isinstance(content, str) and content:
+            set(key, content, ttl)
+        return result
+
+    agent.run = cached_run
+    agent.arun = cached_arun
+    return agent
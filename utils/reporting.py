@@ -1,10 +1,18 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
+import sys
+from collections import deque
+from dataclasses import dataclass, field
+
+# 可选依赖：C 实现的 JSON 序列化，团队运行的大结构化输出序列化快 3-10 倍
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from datetime import datetime
 from pathlib import Path
-from typing import Any, List, Optional
+from typing import Optional, TextIO
 
 from agno.team import Team
 from config_loader import config
@@ -13,7 +21,15 @@ from config_loader import config
 @dataclass
 class ReportContext:
     path: Path
-    lines: List[str]
+    fh: TextIO
+    # 最近 K 轮的内存副本（调试/回看用），超出自动淘汰；
+    # 完整历史以磁盘上的报告文件为准，长会话内存占用有界
+    recent_turns: deque = field(default_factory=deque)
+
+    def close(self) -> None:
+        """关闭报告文件句柄（重复调用安全）"""
+        if not self.fh.closed:
+            self.fh.close()
 
 
 def init_report_session(
@@ -30,13 +46,22 @@ def init_report_session(
         report_base = base_dir / report_base
     report_base.mkdir(parents=True, exist_ok=True)
 
-    started_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    report_path = report_base / f"session_{session_id[:8]}_{started_at.replace(':', '').replace(' ', '_')}.md"
-    lines = [
+    now = datetime.now()
+    started_at = now.strftime("%Y-%m-%d %H:%M:%S")
+    report_path = report_base / f"session_{session_id[:8]}_{now.strftime('%Y-%m-%d_%H%M%S')}.md"
+    # 追加模式句柄全程复用：每轮只写增量，不再整篇重写，
+    # 也不用在内存里攒完整对话
+    fh = report_path.open("a", encoding="utf-8")
+    fh.write(
         f"# 对话报告\n\n**会话 ID**: {session_id}\n**开始时间**: {started_at}\n\n---\n\n"
-    ]
-    report_path.write_text("".join(lines), encoding="utf-8")
-    return ReportContext(path=report_path, lines=lines)
+    )
+    fh.flush()
+    in_memory_turns = config.get_system_config("output.in_memory_turns", 8)
+    return ReportContext(
+        path=report_path,
+        fh=fh,
+        recent_turns=deque(maxlen=in_memory_turns),
+    )
 
 
 def append_report_from_last_run(
@@ -55,19 +80,74 @@ def append_report_from_last_run(
             response_text = last_run.content
         else:
             try:
-                response_text = json.dumps(last_run.content, ensure_ascii=False, indent=2)
+                if orjson is not None:
+                    response_text = orjson.dumps(
+                        last_run.content,
+                        option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+                    ).decode()
+                else:
+                    response_text = json.dumps(
+                        last_run.content, ensure_ascii=False, indent=2
+                    )
             except TypeError:
                 response_text = str(last_run.content)
 
-    report_context.path.parent.mkdir(parents=True, exist_ok=True)
-    report_context.lines.append(
+    turn = (
         "## 用户\n"
         f"{user_input}\n\n"
         "## 助手\n"
         f"{response_text}\n\n"
         "---\n\n"
     )
-    report_context.path.write_text("".join(report_context.lines), encoding="utf-8")
+    report_context.fh.write(turn)
+    report_context.fh.flush()
+    report_context.recent_turns.append(turn)
+
+
+# 报告写入的批量阈值：攒够 ~64 字符再写一次，避免逐 token 的系统调用风暴
+_FLUSH_EVERY = 64
+
+
+def stream_response_to_report(
+    team: Team,
+    session_id: str,
+    user_input: str,
+    report_context: ReportContext,
+) -> None:
+    """流式输出回答，同时把增量内容写入报告文件
+
+    报告在生成过程中就持续落盘，运行中断时已生成的部分不会丢失；
+    而 print_response + 事后整段写入要等整轮完成才有内容。
+    """
+    fh = report_context.fh
+    header = f"## 用户\n{user_input}\n\n## 助手\n"
+    fh.write(header)
+
+    turn_parts: list = [header]
+    pending: list = []
+    pending_size = 0
+    for event in team.run(user_input, stream=True, session_id=session_id):
+        content = getattr(event, "content", None)
+        if not isinstance(content, str) or not content:
+            continue
+        sys.stdout.write(content)
+        sys.stdout.flush()
+        turn_parts.append(content)
+        pending.append(content)
+        pending_size += len(content)
+        if pending_size >= _FLUSH_EVERY:
+            fh.write("".join(pending))
+            pending.clear()
+            pending_size = 0
+
+    if pending:
+        fh.write("".join(pending))
+    fh.write("\n\n---\n\n")
+    fh.flush()
+    sys.stdout.write("\n")
+
+    turn_parts.append("\n\n---\n\n")
+    report_context.recent_turns.append("".join(turn_parts))
 
 
 def setup_reporting(